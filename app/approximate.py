@@ -0,0 +1,142 @@
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from medal_cube import CUBE_KEYS, CUBE_MEASURES, filter_cells, rollup
+from perf import span
+
+# Modo aproximado de los gráficos exploratorios: las agregaciones se responden con una muestra estratificada
+# por Year × Season × NOC (con intervalos de confianza). El resultado exacto del cubo se calcula en otra
+# ejecución: cuando el usuario lo pide o tras IDLE_SECONDS sin interacciones (un fragmento con run_every
+# comprueba el tiempo desde la última ejecución de la página y lanza una nueva).
+STRATA = ["Year", "Season", "NOC"]
+SAMPLE_FRACTION = 0.05
+# Filas mínimas por estrato (los estratos más pequeños se incluyen enteros)
+MIN_STRATUM_ROWS = 5
+CONFIDENCE = 0.95
+APPROXIMATE_CAPTION = f"Resultado aproximado (muestra estratificada, barras de error: IC {CONFIDENCE:.0%})."
+# Claves de st.session_state de los controles de la barra lateral
+MODE_KEY = "approximate_mode"
+REFINE_KEY = "approximate_refine"
+EXACT_KEY = "approximate_exact_requested"
+LAST_RUN_KEY = "approximate_last_run"
+IDLE_KEY = "approximate_idle_refine"
+IDLE_SECONDS = 2
+
+
+def stratified_sample(df, fraction=SAMPLE_FRACTION, min_rows=MIN_STRATUM_ROWS, seed=0):
+    """
+    Muestra aleatoria simple dentro de cada estrato (STRATA) con las columnas del cubo, más el estrato,
+    su número de filas ("stratum_rows") y las filas muestreadas ("stratum_sample").
+    """
+    columns = [col for col in CUBE_KEYS + CUBE_MEASURES if col in df.columns]
+    strata = [col for col in STRATA if col in df.columns]
+    stratum = df.groupby(strata, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    sizes = np.bincount(stratum)[stratum]
+    rng = np.random.default_rng(seed)
+    rank = pd.Series(rng.random(len(df))).groupby(stratum).rank(method="first").to_numpy()
+    take = np.minimum(sizes, np.maximum(min_rows, np.ceil(fraction * sizes))).astype(int)
+    selected = rank <= take
+
+    sample = df.loc[selected, columns].reset_index(drop=True)
+    sample["stratum"] = stratum[selected].astype("int32")
+    sample["stratum_rows"] = sizes[selected].astype("int32")
+    sample["stratum_sample"] = take[selected].astype("int32")
+    return sample
+
+
+def _stratified_variance(rows, keys, value):
+    # Varianza del estimador del total de `value` en cada grupo (muestreo aleatorio simple por estrato):
+    # suma sobre estratos de N² (1 - n/N) s² / n, con s² calculada sobre las n filas del estrato (0 fuera del grupo)
+    frame = rows[keys + ["stratum", "stratum_rows", "stratum_sample"]].assign(
+        _value=value, _square=value ** 2
+    )
+    per_stratum = frame.groupby(keys + ["stratum"], observed=True).agg(
+        s1=("_value", "sum"), s2=("_square", "sum"), N=("stratum_rows", "first"), n=("stratum_sample", "first")
+    )
+    N, n = per_stratum["N"].astype(float), per_stratum["n"].astype(float)
+    s2 = (per_stratum["s2"] - per_stratum["s1"] ** 2 / n) / (n - 1).where(n > 1)
+    variance = (N ** 2 * (1 - n / N) * s2 / n).fillna(0)
+    return variance.groupby(level=keys, observed=True).sum()
+
+
+def approx_rollup(sample, by, where=None, measures=(), confidence=CONFIDENCE):
+    """
+    Estimación de medal_cube.rollup a partir de la muestra estratificada (solo claves que son columnas).
+    Devuelve las claves, "count" y la media de cada medida, cada una con su semiamplitud "<columna>_error".
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rows = filter_cells(sample, where)
+    keys = list(by)
+    weight = rows["stratum_rows"] / rows["stratum_sample"]
+    group_keys = [rows[key] for key in keys]
+
+    result = weight.groupby(group_keys, observed=True).sum().rename("count").to_frame()
+    result["count_error"] = z * np.sqrt(_stratified_variance(rows, keys, pd.Series(1.0, index=rows.index)))
+    for measure in measures:
+        # Estimador de razón de la media, con la varianza linealizada: e = (y - media) / total estimado
+        values = rows[measure]
+        valid_weight = weight.where(values.notna(), 0)
+        total = valid_weight.groupby(group_keys, observed=True).transform("sum")
+        mean = (valid_weight * values.fillna(0)).groupby(group_keys, observed=True).transform("sum") / total
+        residual = ((values - mean) / total).fillna(0)
+        result[measure] = mean.groupby(group_keys, observed=True).first()
+        result[f"{measure}_error"] = z * np.sqrt(_stratified_variance(rows, keys, residual))
+    return result.reset_index()
+
+
+def _idle_check():
+    # Sin interacciones desde hace IDLE_SECONDS: nueva ejecución de la página con los resultados exactos
+    if time.time() - st.session_state.get(LAST_RUN_KEY, 0) >= IDLE_SECONDS:
+        st.session_state[IDLE_KEY] = True
+        st.rerun()
+
+
+# st.fragment(run_every=...) existe desde Streamlit 1.37; sin él, el exacto solo se calcula bajo petición
+_idle_watcher = st.fragment(run_every=IDLE_SECONDS)(_idle_check) if hasattr(st, "fragment") else None
+
+
+def approximate_controls():
+    """
+    Controles del modo aproximado en la barra lateral (el estado queda en st.session_state).
+    Decide si esta ejecución responde con la muestra o con el cubo (ver exact_requested).
+    Devuelve si el modo aproximado está activo.
+    """
+    st.sidebar.subheader("Precisión")
+    approximate = st.sidebar.checkbox(
+        "Modo aproximado (muestra estratificada)",
+        key=MODE_KEY,
+        help="Los gráficos se responden con una muestra e intervalos de confianza mientras se interactúa."
+    )
+    idle_run = st.session_state.pop(IDLE_KEY, False)
+    requested = False
+    if approximate:
+        refine = st.sidebar.checkbox(
+            "Pasar al resultado exacto al dejar de interactuar", value=_idle_watcher is not None, key=REFINE_KEY,
+            disabled=_idle_watcher is None
+        )
+        requested = st.sidebar.button("Calcular resultados exactos")
+        if not idle_run:
+            # Ejecución provocada por el usuario: vuelve a contar el tiempo sin interacciones
+            st.session_state[LAST_RUN_KEY] = time.time()
+        if refine and _idle_watcher is not None and not idle_run and not requested:
+            with st.sidebar:
+                _idle_watcher()
+    st.session_state[EXACT_KEY] = requested or idle_run
+    return approximate
+
+
+def refined_rollup(cube, sample, by, where=None, measures=(), name="rollup"):
+    """
+    Devuelve (tabla, aproximada): en modo aproximado, la estimación con la muestra, salvo en las ejecuciones
+    en las que se piden los resultados exactos (botón o inactividad); en ese caso, y sin modo aproximado,
+    el rollup exacto del cubo. En una misma ejecución nunca se calculan los dos.
+    """
+    if st.session_state.get(MODE_KEY) and sample is not None and not st.session_state.get(EXACT_KEY):
+        with span(f"{name}.approx_rollup"):
+            return approx_rollup(sample, by, where, measures), True
+    with span(f"{name}.rollup"):
+        return rollup(cube, by, where=where, measures=measures), False
@@ -0,0 +1,106 @@
+import io
+
+import pandas as pd
+import streamlit as st
+
+from model_registry import DEFAULT_FEATURES, PARTICIPATION_FEATURES, predict_participation
+
+# Columnas obligatorias del archivo de escenarios (el resto toma los valores por defecto del simulador)
+REQUIRED_FEATURES = ["GDP", "Population", "Annual Anomaly"]
+# Filas que se escalan y predicen en cada llamada al modelo
+CHUNK_SIZE = 50_000
+PREDICTION_COLUMN = "Predicted_Participation"
+# Filas de la vista previa que se muestra en la página
+PREVIEW_ROWS = 10
+
+
+def read_scenarios(file, file_name):
+    """
+    Lee un archivo de escenarios en CSV o Parquet (según su extensión).
+    """
+    if file_name.lower().endswith(".parquet"):
+        return pd.read_parquet(file)
+    return pd.read_csv(file)
+
+
+def prepare_features(scenarios):
+    """
+    Devuelve la matriz de variables del modelo para los escenarios, completando
+    Monthly Anomaly y Participation_Per_Million con sus valores por defecto si faltan.
+    """
+    if scenarios.empty:
+        raise ValueError("El archivo no contiene escenarios.")
+    missing = [col for col in REQUIRED_FEATURES if col not in scenarios.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en el archivo de escenarios: {', '.join(missing)}")
+
+    features = scenarios.reindex(columns=PARTICIPATION_FEATURES)
+    features = features.fillna(DEFAULT_FEATURES)
+    return features.astype("float64")
+
+
+def iter_predictions(participation_model, scenarios, chunk_size=CHUNK_SIZE):
+    """
+    Predice los escenarios por bloques de `chunk_size` filas y devuelve cada bloque
+    con sus columnas originales más la columna de predicción.
+    """
+    features = prepare_features(scenarios)
+    for start in range(0, len(features), chunk_size):
+        stop = start + chunk_size
+        predictions = predict_participation(participation_model, features.iloc[start:stop])
+        yield scenarios.iloc[start:stop].assign(**{PREDICTION_COLUMN: predictions})
+
+
+def write_predictions(chunks, file_format="csv"):
+    """
+    Escribe los bloques de predicciones en memoria, uno a uno, y devuelve el archivo en bytes.
+    """
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sink = pa.BufferOutputStream()
+        writer = None
+        for chunk in chunks:
+            # Todos los bloques se escriben con el esquema del primero
+            schema = writer.schema if writer is not None else None
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+        return sink.getvalue().to_pybytes()
+
+    buffer = io.BytesIO()
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(buffer, index=False, header=(i == 0))
+    return buffer.getvalue()
+
+
+def file_format(file_name):
+    """
+    Formato de salida de las predicciones: el mismo que el del archivo de escenarios.
+    """
+    return "parquet" if file_name.lower().endswith(".parquet") else "csv"
+
+
+@st.cache_data(max_entries=4, show_spinner="Calculando las predicciones...")
+def predict_file(_participation_model, model_key, file_bytes, file_name):
+    """
+    Lee, predice y escribe un archivo de escenarios subido. Se cachea por contenido y nombre del archivo
+    y versión del modelo: las demás interacciones de la página no vuelven a predecir el lote.
+    Devuelve (número de escenarios, archivo de predicciones en bytes, vista previa de PREVIEW_ROWS filas).
+    """
+    scenarios = read_scenarios(io.BytesIO(file_bytes), file_name)
+    preview = []
+
+    def chunks():
+        # La vista previa sale del primer bloque ya predicho
+        for chunk in iter_predictions(_participation_model, scenarios):
+            if not preview:
+                preview.append(chunk.head(PREVIEW_ROWS))
+            yield chunk
+
+    result_bytes = write_predictions(chunks(), file_format(file_name))
+    return len(scenarios), result_bytes, preview[0]
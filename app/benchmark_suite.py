@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from batch_prediction import iter_predictions
+from country_codes import load_country_codes, map_country_codes
+from data_loader import APP_DIR, DATASET_CSV, PROFILE_JSON, parquet_is_current
+from dataset_profile import profile_dataframe, read_profile
+from forecasting import ARIMA_ORDER
+from features import add_features
+from medal_cube import MEDAL_TYPES, build_cube, rollup
+from model_registry import load_participation_model
+
+# Benchmark de los cálculos de cada página sobre datos sintéticos con el esquema de final_dataset_cleaned.csv,
+# a 1×, 10× y 100× el número de filas real, sin navegador:
+#   python app/benchmark_suite.py [--scales 1 10 100] [--save-baseline] [--tolerance 0.25]
+# Sin --save-baseline, los tiempos se comparan con el baseline guardado y se marcan las regresiones.
+BASELINE_PATH = os.path.join(APP_DIR, "benchmarks", "baseline.json")
+# Filas del dataset limpio (aprox.) si no están disponibles ni su perfil ni el CSV (ver reference_rows)
+DEFAULT_REFERENCE_ROWS = 200_000
+SCALES = [1, 10, 100]
+REPEAT = 3
+REGRESSION_TOLERANCE = 0.25
+
+SUMMER_YEARS = list(range(1896, 2017, 4))
+WINTER_YEARS = list(range(1924, 1993, 4)) + list(range(1994, 2015, 4))
+REGIONS = [
+    "East Asia & Pacific", "Europe & Central Asia", "Latin America & Caribbean", "Middle East & North Africa",
+    "North America", "South Asia", "Sub-Saharan Africa",
+]
+INCOME_GROUPS = ["High income", "Upper middle income", "Lower middle income", "Low income"]
+SPORTS = [f"Sport {i:02d}" for i in range(66)] + ["Athletics", "Gymnastics", "Rowing", "Fencing"]
+# Proporciones aproximadas del dataset real
+MEDAL_WEIGHTS = {"No Medal": 0.853, "Gold": 0.049, "Silver": 0.048, "Bronze": 0.050}
+
+
+def reference_rows():
+    """
+    Filas de final_dataset_cleaned.csv, referencia de la escala 1×: del perfil del dataset si está al día,
+    si no contando las filas del CSV, y DEFAULT_REFERENCE_ROWS si no existe ninguno de los dos.
+    """
+    if os.path.exists(DATASET_CSV) and parquet_is_current(PROFILE_JSON):
+        return int(read_profile(PROFILE_JSON)["rows"])
+    if os.path.exists(DATASET_CSV):
+        return len(pd.read_csv(DATASET_CSV, usecols=[0]))
+    return DEFAULT_REFERENCE_ROWS
+
+
+def synthetic_dataset(n_rows, seed=0):
+    """
+    Dataset sintético con las columnas y tipos de final_dataset_cleaned.csv. Los atributos de país
+    (región, grupo de ingresos, PIB y población) y de año (anomalías) son coherentes entre filas,
+    como en el dataset real, para que el cubo tenga un número de celdas realista.
+    """
+    rng = np.random.default_rng(seed)
+    nocs = np.array(load_country_codes().index)
+    editions = pd.DataFrame({
+        "Year": SUMMER_YEARS + WINTER_YEARS,
+        "Season": ["Summer"] * len(SUMMER_YEARS) + ["Winter"] * len(WINTER_YEARS),
+    })
+    years = np.arange(1896, 2017)
+
+    noc_idx = rng.integers(0, len(nocs), n_rows)
+    edition_idx = rng.integers(0, len(editions), n_rows)
+    year = editions["Year"].to_numpy()[edition_idx]
+
+    region = rng.integers(0, len(REGIONS) + 1, len(nocs))
+    income = rng.integers(0, len(INCOME_GROUPS) + 1, len(nocs))
+    gdp = rng.lognormal(24, 2, (len(nocs), len(years))) * (years >= 1960)
+    population = rng.lognormal(16, 1.5, (len(nocs), len(years))) * (years >= 1960)
+    annual_anomaly = np.linspace(-0.3, 0.9, len(years)) + rng.normal(0, 0.1, len(years))
+    monthly_anomaly = annual_anomaly + rng.normal(0, 0.2, len(years))
+    year_pos = year - years[0]
+
+    df = pd.DataFrame({
+        "Sex": pd.Categorical.from_codes(rng.choice(2, n_rows, p=[0.73, 0.27]), ["M", "F"]),
+        "Age": rng.normal(25.5, 5.5, n_rows).clip(15, 60),
+        "Height": rng.normal(175, 10, n_rows).clip(130, 220),
+        "Weight": rng.normal(70, 13, n_rows).clip(30, 200),
+        "NOC": pd.Categorical.from_codes(noc_idx, nocs),
+        "Year": year.astype("int16"),
+        "Season": pd.Categorical(editions["Season"].to_numpy()[edition_idx]),
+        "Sport": pd.Categorical.from_codes(rng.integers(0, len(SPORTS), n_rows), SPORTS),
+        "Medal": pd.Categorical.from_codes(
+            rng.choice(len(MEDAL_WEIGHTS), n_rows, p=list(MEDAL_WEIGHTS.values())), list(MEDAL_WEIGHTS)
+        ),
+        # Los códigos fuera de rango son países sin metadatos (NaN, como en el dataset real)
+        "Region": pd.Categorical.from_codes(np.where(region < len(REGIONS), region, -1)[noc_idx], REGIONS),
+        "Income Group": pd.Categorical.from_codes(
+            np.where(income < len(INCOME_GROUPS), income, -1)[noc_idx], INCOME_GROUPS
+        ),
+        "Population": population[noc_idx, year_pos],
+        "Country Code": np.where(year >= 1960, nocs[noc_idx], None),
+        "GDP": gdp[noc_idx, year_pos],
+        "Annual Anomaly": annual_anomaly[year_pos],
+        "Monthly Anomaly": monthly_anomaly[year_pos],
+    })
+    return df
+
+
+def _eda_gdp_range(cube):
+    return rollup(cube, ["PIB_Rango"], where={"Medal": MEDAL_TYPES}, observed=False)
+
+
+def _eda_sport_climate(cube):
+    rollup(cube, ["Sport"], measures=["Annual Anomaly"]).sort_values("Annual Anomaly", ascending=False).head(10)
+    return rollup(cube, ['Sport Category', 'Year'], measures=['Annual Anomaly'])
+
+
+def _cda_sport_growth(cube):
+    recent_decades = {"Year": (1980, None)}
+    top_sports = rollup(cube, ["Sport"], where=recent_decades).nlargest(10, "count")["Sport"]
+    return rollup(cube, ["Year", "Sport"], where={**recent_decades, "Sport": list(top_sports)})
+
+
+def _map_medals(cube):
+    year = int(cube["Year"].max())
+    season = cube.loc[cube["Year"] == year, "Season"].iloc[0]
+    country_medals = rollup(cube, ["NOC"], where={"Year": year, "Season": season, "Medal": MEDAL_TYPES})
+    return map_country_codes(country_medals, load_country_codes(), "count")
+
+
+def _xgboost_predictions(df):
+    scenarios = df[["GDP", "Population", "Annual Anomaly", "Monthly Anomaly"]]
+    for _ in iter_predictions(load_participation_model(), scenarios):
+        pass
+
+
+def _arima_forecast(cube):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    series = rollup(cube, ["Year"], where={"Medal": MEDAL_TYPES})["count"].reset_index(drop=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ARIMA(series, order=ARIMA_ORDER).fit().forecast(steps=5)
+
+
+# Cálculos de cada página: (página, tarea) -> función de (dataset, cubo)
+TASKS = {
+    ("data", "build_cube"): lambda df, cube: build_cube(df),
+    ("data", "add_features"): lambda df, cube: add_features(df),
+    ("data", "build_profile"): lambda df, cube: profile_dataframe(df),
+    ("EDA", "top_countries"): lambda df, cube: rollup(cube, ["NOC"]).nlargest(10, "count"),
+    ("EDA", "income_gdp"): lambda df, cube: rollup(cube, ["Income Group"], measures=["GDP"]),
+    ("EDA", "gdp_range"): lambda df, cube: _eda_gdp_range(cube),
+    ("EDA", "sport_climate"): lambda df, cube: _eda_sport_climate(cube),
+    ("CDA", "gdp_medals"): lambda df, cube: rollup(cube, ["NOC"], where={"Medal": MEDAL_TYPES}, measures=["GDP"]),
+    ("CDA", "sport_growth"): lambda df, cube: _cda_sport_growth(cube),
+    ("CDA", "income_trend"): lambda df, cube: rollup(cube, ["Year", "Income Group"], where={"Medal": MEDAL_TYPES}),
+    ("CDA", "hypotheses"): lambda df, cube: (
+        rollup(cube, ["Income Group"], measures=["GDP"]), rollup(cube, ["NOC"], measures=["Population"])
+    ),
+    ("MAPA", "country_medals"): lambda df, cube: _map_medals(cube),
+    ("MODELO", "xgboost_predict"): lambda df, cube: _xgboost_predictions(df),
+    ("ARIMA", "fit_forecast"): lambda df, cube: _arima_forecast(cube),
+}
+
+
+def run_benchmarks(scales=SCALES, rows=None, repeat=REPEAT):
+    """
+    Genera el dataset sintético de cada escala (`rows` filas por 1×, por defecto reference_rows())
+    y mide la mediana de `repeat` ejecuciones de cada tarea.
+    Una tarea que falla (p. ej. sin el modelo XGBoost) se registra con Seconds = NaN y su error.
+    """
+    rows = rows or reference_rows()
+    results = []
+    for scale in scales:
+        # Las variables derivadas se añaden como en data_loader.read_dataset_csv
+        df = add_features(synthetic_dataset(rows * scale, seed=scale))
+        cube = build_cube(df)
+        for (page, task), func in TASKS.items():
+            record = {"Scale": scale, "Rows": len(df), "Page": page, "Task": task}
+            try:
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    func(df, cube)
+                    times.append(time.perf_counter() - start)
+                record["Seconds"] = statistics.median(times)
+            except Exception as e:
+                record.update(Seconds=np.nan, Error=str(e))
+            results.append(record)
+            print(f"{scale:>4}× {page:<7} {task:<16} {record['Seconds']:.4f} s", file=sys.stderr)
+        del df, cube
+    return pd.DataFrame(results)
+
+
+def compare_with_baseline(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """
+    Añade el tiempo del baseline y marca como regresión las tareas más lentas que el baseline en más de `tolerance`.
+    """
+    keys = ["Scale", "Page", "Task"]
+    merged = results.merge(baseline[keys + ["Seconds"]].rename(columns={"Seconds": "Baseline"}), on=keys, how="left")
+    merged["Ratio"] = merged["Seconds"] / merged["Baseline"]
+    merged["Regression"] = merged["Ratio"] > 1 + tolerance
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de los cálculos de las páginas con datos sintéticos.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="Múltiplos del número de filas real")
+    parser.add_argument("--rows", type=int, default=None, help="Filas de la escala 1× (por defecto, las del dataset limpio)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Repeticiones por tarea (se usa la mediana)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Archivo JSON del baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como nuevo baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="Aumento relativo tolerado")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.rows, args.repeat)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results.to_dict("records"), f, indent=2)
+        print(results.to_string(index=False))
+        print(f"Baseline guardado en {args.baseline}")
+    elif os.path.exists(args.baseline):
+        report = compare_with_baseline(results, pd.read_json(args.baseline), tolerance=args.tolerance)
+        print(report.to_string(index=False))
+        if report["Regression"].any():
+            sys.exit(1)
+    else:
+        print(results.to_string(index=False))
+        print(f"No hay baseline en {args.baseline}: ejecuta con --save-baseline para guardarlo.")
@@ -0,0 +1,71 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from pandas.api.types import is_numeric_dtype
+
+from perf import PERF_ENABLED, span
+
+# Por encima de WEBGL_THRESHOLD puntos los scatter se dibujan con WebGL (scattergl);
+# por encima de MAX_POINTS se envía al navegador una muestra de MAX_POINTS puntos
+WEBGL_THRESHOLD = 1000
+MAX_POINTS = 20_000
+# Columna auxiliar con el código numérico de la categoría que colorea un scatter
+COLOR_CODE = "_color_code"
+
+
+def figure_size(fig):
+    """
+    Tamaño en bytes de la figura serializada (lo que se envía al navegador).
+    """
+    return len(fig.to_json().encode("utf-8"))
+
+
+def downsample(data, max_points=MAX_POINTS, seed=0):
+    """
+    Muestra reproducible de como mucho `max_points` filas, en el orden original.
+    """
+    if len(data) <= max_points:
+        return data
+    return data.sample(n=max_points, random_state=seed).sort_index()
+
+
+def lean_scatter(data, x, y, color=None, hover_data=None, max_points=MAX_POINTS, **kwargs):
+    """
+    px.scatter con una figura ligera:
+    - un color categórico se convierte en un único trace con un array de colores (en lugar de un trace
+      por categoría) y la categoría se muestra en el hover;
+    - con muchos puntos se usa WebGL y por encima de `max_points` se dibuja una muestra.
+    Devuelve (figura, número de puntos originales).
+    """
+    n_points = len(data)
+    data = downsample(data, max_points)
+    hover_data = list(hover_data or [])
+    categorical_color = color is not None and not is_numeric_dtype(data[color])
+    if categorical_color:
+        data = data.assign(**{COLOR_CODE: pd.Categorical(data[color]).codes})
+        hover_data = [color] + [col for col in hover_data if col != color]
+        kwargs.setdefault("color_continuous_scale", "Turbo")
+
+    fig = px.scatter(
+        data,
+        x=x,
+        y=y,
+        color=COLOR_CODE if categorical_color else color,
+        hover_data={**{col: True for col in hover_data}, **({COLOR_CODE: False} if categorical_color else {})} or None,
+        render_mode="webgl" if len(data) > WEBGL_THRESHOLD else "svg",
+        **kwargs
+    )
+    if categorical_color:
+        fig.update_coloraxes(showscale=False)
+    return fig, n_points
+
+
+def show_chart(fig, name):
+    """
+    st.plotly_chart medido con perf.span; si las mediciones están activas, se añade el tamaño de la figura.
+    """
+    size = figure_size(fig) if PERF_ENABLED else None
+    with span(f"{name}.chart") as fields:
+        if size is not None:
+            fields["bytes"] = size
+        st.plotly_chart(fig)
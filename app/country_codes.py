@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+# Tabla NOC -> ISO-3 incluida en el repositorio (sin descargas en tiempo de ejecución).
+# Los NOC históricos (URS, GDR, FRG, EUN, TCH, YUG...) se asocian al país actual que los sucede;
+# los que no corresponden a ningún país (IOA, ROT, WIF, UNK...) tienen el ISO-3 vacío.
+COUNTRY_CODES_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "noc_country_codes.csv")
+
+
+@st.cache_resource
+def load_country_codes(path=COUNTRY_CODES_CSV):
+    """
+    Carga la tabla de códigos una vez por proceso, indexada por NOC.
+    """
+    codes = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return codes.set_index("NOC")[["ISO3", "Country"]]
+
+
+def map_country_codes(country_data, codes, value_column, by=()):
+    """
+    Asocia cada NOC de `country_data` a su código ISO-3 y suma `value_column` por país,
+    ya que varios NOC pueden corresponder al mismo país (p. ej. FRG y GDR -> DEU).
+    by: columnas adicionales de `country_data` que se conservan en la agrupación (p. ej. "Year").
+    Devuelve el DataFrame por país (columnas de `by`, ISO3, Country, valor, NOC) y la lista de NOC sin código ISO-3.
+    """
+    nocs = country_data["NOC"].astype(str)
+    matched = codes.reindex(nocs.to_numpy())
+    iso3 = matched["ISO3"].fillna("").to_numpy()
+    has_code = iso3 != ""
+
+    unmapped = sorted(set(nocs[~has_code]))
+    mapped = pd.DataFrame({
+        **{col: country_data[col].to_numpy()[has_code] for col in by},
+        "ISO3": iso3[has_code],
+        "Country": matched["Country"].to_numpy()[has_code],
+        value_column: country_data[value_column].to_numpy()[has_code],
+        "NOC": nocs.to_numpy()[has_code],
+    })
+    by_country = mapped.groupby([*by, "ISO3", "Country"], as_index=False).agg({value_column: "sum", "NOC": ", ".join})
+    return by_country, unmapped
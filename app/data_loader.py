@@ -0,0 +1,225 @@
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from approximate import stratified_sample
+from dataset_profile import profile_dataframe, read_profile, write_profile
+from features import add_features, registry_digest
+from medal_cube import build_cube
+
+# Rutas del dataset: el CSV generado por el notebook y su copia columnar (Parquet)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES_DIR = os.path.join(APP_DIR, "pages")
+DATASET_CSV = os.path.join(PAGES_DIR, "final_dataset_cleaned.csv")
+DATASET_PARQUET = os.path.join(PAGES_DIR, "final_dataset_cleaned.parquet")
+CUBE_PARQUET = os.path.join(PAGES_DIR, "final_dataset_cube.parquet")
+# Perfil del dataset (ver dataset_profile), calculado una vez por versión del dataset
+PROFILE_JSON = os.path.join(PAGES_DIR, "final_dataset_profile.json")
+# Muestra estratificada para el modo aproximado (ver approximate)
+SAMPLE_PARQUET = os.path.join(PAGES_DIR, "final_dataset_sample.parquet")
+# Huella del registro de variables derivadas con la que se construyeron los archivos anteriores (ver features)
+FEATURES_JSON = os.path.join(PAGES_DIR, "final_dataset_features.json")
+# El cubo se guarda ordenado por estas columnas y en row groups de este tamaño, para que las consultas
+# con filtros (ver query_engine) se salten los row groups que no cumplen el filtro
+CUBE_SORT_COLUMNS = ["Year", "Season"]
+CUBE_ROW_GROUP_ROWS = 50_000
+
+# Tipos de las columnas: categorías para los textos repetidos y enteros estrechos para el año
+CATEGORICAL_COLUMNS = ["Sex", "NOC", "Season", "Sport", "Medal", "Region", "Income Group"]
+INTEGER_COLUMNS = {"Year": "int16"}
+
+
+def _column_dtypes(csv_path):
+    """
+    Devuelve los tipos a aplicar al leer el CSV, solo para las columnas que existen en él.
+    """
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS if col in columns}
+    dtypes.update({col: dtype for col, dtype in INTEGER_COLUMNS.items() if col in columns})
+    return dtypes
+
+
+def read_dataset_csv(csv_path=DATASET_CSV):
+    """
+    Lee el CSV del dataset final aplicando directamente los tipos categóricos y enteros
+    y añade las variables derivadas del registro (ver features).
+    """
+    return add_features(pd.read_csv(csv_path, dtype=_column_dtypes(csv_path)))
+
+
+def _write_parquet(df, path, **kwargs):
+    # Escritura atómica para que otros procesos nunca lean un archivo a medias
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def dataset_artifacts(csv_path=DATASET_CSV):
+    """
+    Rutas de los archivos que se generan a partir de un CSV del dataset. Para el CSV de la aplicación son
+    las constantes de este módulo; para cualquier otro, archivos junto al CSV con su nombre como prefijo,
+    de modo que construir otro dataset nunca sobrescribe los de la aplicación.
+    """
+    if os.path.abspath(csv_path) == os.path.abspath(DATASET_CSV):
+        return {
+            "parquet": DATASET_PARQUET, "cube": CUBE_PARQUET, "profile": PROFILE_JSON,
+            "sample": SAMPLE_PARQUET, "features": FEATURES_JSON,
+        }
+    stem = os.path.splitext(csv_path)[0]
+    return {
+        "parquet": f"{stem}.parquet", "cube": f"{stem}_cube.parquet", "profile": f"{stem}_profile.json",
+        "sample": f"{stem}_sample.parquet", "features": f"{stem}_features.json",
+    }
+
+
+def build_dataset(csv_path=DATASET_CSV):
+    """
+    Construye a partir del CSV los archivos de dataset_artifacts: la copia Parquet tipada, el cubo de agregados,
+    el perfil, la muestra estratificada y la huella del registro de variables con la que se generaron.
+    """
+    artifacts = dataset_artifacts(csv_path)
+    df = read_dataset_csv(csv_path)
+    write_profile(profile_dataframe(df), artifacts["profile"])
+    _write_parquet(df, artifacts["parquet"])
+    cube = build_cube(df)
+    sort_columns = [col for col in CUBE_SORT_COLUMNS if col in cube.columns]
+    _write_parquet(cube.sort_values(sort_columns, ignore_index=True), artifacts["cube"], row_group_size=CUBE_ROW_GROUP_ROWS)
+    _write_parquet(stratified_sample(df), artifacts["sample"])
+    with open(artifacts["features"], "w", encoding="utf-8") as f:
+        json.dump({"registry": registry_digest()}, f)
+    return df
+
+
+def dataset_version(csv_path=DATASET_CSV, parquet_path=DATASET_PARQUET):
+    """
+    Identificador de la versión del dataset (fecha de modificación y tamaño del archivo fuente
+    y huella del registro de variables derivadas).
+    """
+    source = csv_path if os.path.exists(csv_path) else parquet_path
+    stat = os.stat(source)
+    return f"{stat.st_mtime_ns}-{stat.st_size}-{registry_digest()[:12]}"
+
+
+def _features_current(features_path=FEATURES_JSON):
+    # Los archivos generados se construyeron con el registro de variables actual
+    try:
+        with open(features_path, encoding="utf-8") as f:
+            return json.load(f).get("registry") == registry_digest()
+    except (OSError, ValueError):
+        return False
+
+
+def _is_stale(csv_path, parquet_path):
+    if not os.path.exists(parquet_path):
+        return True
+    if not os.path.exists(csv_path):
+        return False
+    if not _features_current():
+        return True
+    return os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)
+
+
+def artifacts_are_current(csv_path=DATASET_CSV):
+    """
+    Indica si todos los archivos generados a partir del CSV existen, no son más antiguos que él
+    y se construyeron con el registro de variables actual.
+    """
+    artifacts = dataset_artifacts(csv_path)
+    if not os.path.exists(csv_path) or not _features_current(artifacts["features"]):
+        return False
+    return all(
+        os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(csv_path) for path in artifacts.values()
+    )
+
+
+def parquet_is_current(parquet_path, csv_path=DATASET_CSV):
+    """
+    Indica si el Parquet existe y no es más antiguo que el CSV del que se genera.
+    """
+    return not _is_stale(csv_path, parquet_path)
+
+
+@st.cache_resource(max_entries=1, show_spinner="Cargando dataset...")
+def _load_dataset(version):
+    if _is_stale(DATASET_CSV, DATASET_PARQUET) or _is_stale(DATASET_CSV, CUBE_PARQUET):
+        try:
+            return build_dataset()
+        except ImportError:
+            # Sin pyarrow no se puede escribir Parquet: se usa el CSV con los mismos tipos
+            return read_dataset_csv()
+    return pd.read_parquet(DATASET_PARQUET)
+
+
+def load_dataset():
+    """
+    Devuelve el dataset final, cargado una sola vez por proceso y compartido por todas las sesiones.
+    El DataFrame es compartido: las páginas no deben modificarlo (añadir columnas, inplace, etc.).
+    """
+    return _load_dataset(dataset_version())
+
+
+def read_cube():
+    """
+    Lee el cubo de agregados sin caché de Streamlit (para procesos por lotes fuera de la aplicación).
+    """
+    if not _is_stale(DATASET_CSV, CUBE_PARQUET):
+        return pd.read_parquet(CUBE_PARQUET)
+    return build_cube(read_dataset_csv())
+
+
+@st.cache_resource(max_entries=1, show_spinner="Cargando agregados...")
+def _load_cube(version):
+    if not _is_stale(DATASET_CSV, CUBE_PARQUET):
+        return pd.read_parquet(CUBE_PARQUET)
+    # Sin cubo en disco (p. ej. sin pyarrow) se construye en memoria a partir del dataset
+    return build_cube(_load_dataset(version))
+
+
+def load_cube():
+    """
+    Devuelve el cubo de agregados (ver medal_cube), compartido por todas las sesiones del proceso.
+    Las páginas lo consultan con medal_cube.rollup en lugar de agrupar el dataset completo.
+    """
+    return _load_cube(dataset_version())
+
+
+@st.cache_resource(max_entries=1, show_spinner="Cargando muestra estratificada...")
+def _load_sample(version):
+    if not _is_stale(DATASET_CSV, SAMPLE_PARQUET):
+        return pd.read_parquet(SAMPLE_PARQUET)
+    return stratified_sample(_load_dataset(version))
+
+
+def load_sample():
+    """
+    Devuelve la muestra estratificada del modo aproximado, compartida por todas las sesiones del proceso.
+    """
+    return _load_sample(dataset_version())
+
+
+@st.cache_resource(max_entries=1, show_spinner="Cargando perfil del dataset...")
+def _load_profile(version):
+    if not _is_stale(DATASET_CSV, PROFILE_JSON):
+        return read_profile(PROFILE_JSON)
+    profile = profile_dataframe(_load_dataset(version))
+    try:
+        write_profile(profile, PROFILE_JSON)
+    except OSError:
+        # Sin permisos de escritura el perfil se conserva solo en memoria
+        pass
+    return profile
+
+
+def load_profile():
+    """
+    Devuelve el perfil del dataset (ver dataset_profile), calculado una sola vez por versión del dataset.
+    """
+    return _load_profile(dataset_version())
+
+
+if __name__ == "__main__":
+    # Permite regenerar el Parquet sin arrancar la aplicación: python app/data_loader.py
+    dataset = build_dataset()
+    print(f"Dataset guardado en {DATASET_PARQUET}: {dataset.shape[0]} filas, {dataset.shape[1]} columnas")
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+# Perfil del dataset (lo que antes calculaba df.describe() en cada ejecución de la página EDA):
+#   python app/dataset_profile.py CSV [--chunk-rows N] [--output JSON]
+# Se calcula por bloques y los perfiles parciales se combinan con merge_profiles:
+# - columnas numéricas: momentos exactos y un resumen de cuantiles de tamaño fijo;
+# - columnas categóricas: HyperLogLog para los valores distintos y Misra-Gries para los más frecuentes;
+# - todas las columnas: número de nulos.
+PROFILE_CHUNK_ROWS = 100_000
+QUANTILE_CENTROIDS = 500
+HLL_PRECISION = 12
+TOP_K_CAPACITY = 100
+TOP_K = 10
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+# Cuantiles: centroides (valor medio, peso) ordenados, comprimidos a QUANTILE_CENTROIDS grupos de igual peso
+
+def _compress(values, weights, size=QUANTILE_CENTROIDS):
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+    if len(values) <= size:
+        return values, weights
+    cumulative = np.cumsum(weights)
+    bucket = np.minimum(((cumulative - weights / 2) / cumulative[-1] * size).astype(int), size - 1)
+    bucket_weights = np.bincount(bucket, weights=weights, minlength=size)
+    bucket_sums = np.bincount(bucket, weights=values * weights, minlength=size)
+    keep = bucket_weights > 0
+    return bucket_sums[keep] / bucket_weights[keep], bucket_weights[keep]
+
+
+def _quantile(summary, q):
+    values, weights = np.asarray(summary["centroids"]), np.asarray(summary["weights"])
+    if len(values) == 0:
+        return np.nan
+    positions = np.cumsum(weights) - weights / 2
+    return float(np.clip(np.interp(q * weights.sum(), positions, values), summary["min"], summary["max"]))
+
+
+# Valores distintos: HyperLogLog con 2**HLL_PRECISION registros (se combinan con el máximo)
+
+def _bit_length(words):
+    length = np.zeros(len(words), dtype=np.int64)
+    words = words.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = words >= np.uint64(1 << shift)
+        length[high] += shift
+        words[high] >>= np.uint64(shift)
+    return length + (words > 0)
+
+
+def _hll_registers(values, precision=HLL_PRECISION):
+    registers = np.zeros(1 << precision, dtype=np.int64)
+    if len(values) == 0:
+        return registers
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = hashes & np.uint64((1 << (64 - precision)) - 1)
+    rank = (64 - precision) - _bit_length(rest) + 1
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def _hll_estimate(registers):
+    registers = np.asarray(registers)
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.power(2.0, -registers).sum()
+    zeros = (registers == 0).sum()
+    if estimate <= 2.5 * m and zeros:
+        # Corrección para pocos valores distintos (linear counting)
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+# Más frecuentes: resumen de Misra-Gries con TOP_K_CAPACITY contadores (los recuentos son cotas inferiores)
+
+def _misra_gries(counts, capacity=TOP_K_CAPACITY):
+    if len(counts) <= capacity:
+        return counts
+    threshold = sorted(counts.values(), reverse=True)[capacity]
+    return {value: count - threshold for value, count in counts.items() if count > threshold}
+
+
+def profile_chunk(df):
+    """
+    Perfil de un bloque del dataset (solo tipos simples, serializable en JSON).
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        present = series.dropna()
+        nulls = int(len(series) - len(present))
+        if is_numeric_dtype(series):
+            values = present.to_numpy(dtype=float)
+            centroids, weights = _compress(values, np.ones(len(values)))
+            columns[column] = {
+                "kind": "numeric",
+                "nulls": nulls,
+                "count": len(values),
+                "mean": float(values.mean()) if len(values) else 0.0,
+                "m2": float(((values - values.mean()) ** 2).sum()) if len(values) else 0.0,
+                "min": float(values.min()) if len(values) else np.inf,
+                "max": float(values.max()) if len(values) else -np.inf,
+                "centroids": centroids.tolist(),
+                "weights": weights.tolist(),
+            }
+        else:
+            present = present.astype(str)
+            counts = present.value_counts()
+            columns[column] = {
+                "kind": "categorical",
+                "nulls": nulls,
+                "count": len(present),
+                "registers": _hll_registers(present).tolist(),
+                "top": _misra_gries({str(value): int(count) for value, count in counts.items()}),
+            }
+    return {"rows": len(df), "columns": columns}
+
+
+def _merge_numeric(a, b):
+    count = a["count"] + b["count"]
+    if count == 0:
+        return dict(a, nulls=a["nulls"] + b["nulls"])
+    delta = b["mean"] - a["mean"]
+    centroids, weights = _compress(
+        np.concatenate([a["centroids"], b["centroids"]]), np.concatenate([a["weights"], b["weights"]])
+    )
+    return {
+        "kind": "numeric",
+        "nulls": a["nulls"] + b["nulls"],
+        "count": count,
+        # Combinación de medias y sumas de cuadrados por bloques (Chan et al.)
+        "mean": a["mean"] + delta * b["count"] / count,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * a["count"] * b["count"] / count,
+        "min": min(a["min"], b["min"]),
+        "max": max(a["max"], b["max"]),
+        "centroids": centroids.tolist(),
+        "weights": weights.tolist(),
+    }
+
+
+def _merge_categorical(a, b):
+    top = dict(a["top"])
+    for value, count in b["top"].items():
+        top[value] = top.get(value, 0) + count
+    return {
+        "kind": "categorical",
+        "nulls": a["nulls"] + b["nulls"],
+        "count": a["count"] + b["count"],
+        "registers": np.maximum(a["registers"], b["registers"]).tolist(),
+        "top": _misra_gries(top),
+    }
+
+
+def merge_profiles(a, b):
+    """
+    Combina los perfiles de dos bloques con las mismas columnas.
+    """
+    columns = {}
+    for column, summary in a["columns"].items():
+        other = b["columns"][column]
+        if summary["kind"] != other["kind"]:
+            raise ValueError(f"La columna {column} tiene tipos distintos en los bloques")
+        merge = _merge_numeric if summary["kind"] == "numeric" else _merge_categorical
+        columns[column] = merge(summary, other)
+    return {"rows": a["rows"] + b["rows"], "columns": columns}
+
+
+def build_profile(chunks):
+    """
+    Perfil de un dataset a partir de sus bloques (DataFrames con las mismas columnas).
+    """
+    profile = None
+    for chunk in chunks:
+        partial = profile_chunk(chunk)
+        profile = partial if profile is None else merge_profiles(profile, partial)
+    if profile is None:
+        raise ValueError("No hay bloques para perfilar")
+    return profile
+
+
+def profile_dataframe(df, chunk_rows=PROFILE_CHUNK_ROWS):
+    """
+    Perfil de un DataFrame ya cargado, calculado por bloques de `chunk_rows` filas.
+    """
+    return build_profile(df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows))
+
+
+def numeric_summary(profile):
+    """
+    Tabla equivalente a df.describe() a partir del perfil (los cuantiles son aproximados).
+    """
+    table = {}
+    for column, summary in profile["columns"].items():
+        if summary["kind"] != "numeric":
+            continue
+        count = summary["count"]
+        table[column] = {
+            "count": count,
+            "mean": summary["mean"] if count else np.nan,
+            "std": np.sqrt(summary["m2"] / (count - 1)) if count > 1 else np.nan,
+            "min": summary["min"] if count else np.nan,
+            **{f"{q:.0%}": _quantile(summary, q) for q in QUANTILES},
+            "max": summary["max"] if count else np.nan,
+        }
+    return pd.DataFrame(table)
+
+
+def categorical_summary(profile, top_k=TOP_K):
+    """
+    Nulos, valores distintos (aproximados) y valores más frecuentes de las columnas categóricas.
+    """
+    rows = []
+    for column, summary in profile["columns"].items():
+        if summary["kind"] != "categorical":
+            continue
+        top = sorted(summary["top"].items(), key=lambda item: item[1], reverse=True)[:top_k]
+        rows.append({
+            "Columna": column,
+            "No nulos": summary["count"],
+            "Distintos (aprox.)": _hll_estimate(summary["registers"]),
+            "Más frecuentes": ", ".join(value for value, _ in top),
+        })
+    return pd.DataFrame(rows)
+
+
+def null_counts(profile):
+    """
+    Número de valores nulos de cada columna.
+    """
+    return pd.Series({column: summary["nulls"] for column, summary in profile["columns"].items()}, name="Nulos")
+
+
+def write_profile(profile, path):
+    # Escritura atómica, como los Parquet del dataset
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    os.replace(tmp_path, path)
+
+
+def read_profile(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil por bloques de un CSV.")
+    parser.add_argument("csv", help="CSV a perfilar")
+    parser.add_argument("--chunk-rows", type=int, default=PROFILE_CHUNK_ROWS, help="Filas por bloque")
+    parser.add_argument("--output", help="Guarda el perfil en este JSON")
+    args = parser.parse_args()
+
+    profile = build_profile(pd.read_csv(args.csv, chunksize=args.chunk_rows))
+    if args.output:
+        write_profile(profile, args.output)
+    print(f"{profile['rows']} filas")
+    print(numeric_summary(profile).to_string())
+    print(categorical_summary(profile).to_string(index=False))
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Registro de variables derivadas del dataset final. Se calculan una vez al construir el dataset
+# (data_loader.build_dataset), vectorizadas, y se guardan como columnas del Parquet y del cubo:
+# las páginas las leen en lugar de derivarlas en cada ejecución.
+# Cambiar el cálculo de una variable exige subir su versión: la huella del registro (registry_digest)
+# cambia y los Parquet se reconstruyen.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Taxonomía deporte -> categoría (Outdoor / Indoor); los deportes que no aparecen son OTHER_CATEGORY
+SPORT_CATEGORIES_CSV = os.path.join(DATA_DIR, "sport_categories.csv")
+OTHER_CATEGORY = "Other"
+SPORT_CATEGORY_ORDER = ["Outdoor", "Indoor", OTHER_CATEGORY]
+# Grupos de ingresos que el notebook considera países desarrollados
+DEVELOPED_INCOME_GROUPS = ["High income", "Upper middle income"]
+DEVELOPMENT_STATUS_ORDER = ["Desarrollados", "En desarrollo"]
+GDP_RANGE_LABELS = ["Bajo", "Medio Bajo", "Medio", "Medio Alto", "Alto"]
+PIB_RANGO_BINS = [0, 1e10, 5e10, 1e11, 5e11, 1e12, 1.5e12]
+PIB_RANGO_LABELS = ['<10B', '10B-50B', '50B-100B', '100B-500B', '500B-1T', '>1T']
+
+Feature = namedtuple("Feature", ["inputs", "compute", "version"])
+
+
+def load_sport_categories(path=SPORT_CATEGORIES_CSV):
+    """
+    Taxonomía de deportes como Series deporte -> categoría.
+    """
+    return pd.read_csv(path, dtype=str).set_index("Sport")["Category"]
+
+
+def _sport_category(df):
+    # Series.map sobre una columna categórica se evalúa una vez por categoría, no por fila
+    category = df["Sport"].map(load_sport_categories()).astype(object).fillna(OTHER_CATEGORY)
+    return category.astype(pd.CategoricalDtype(SPORT_CATEGORY_ORDER))
+
+
+def _decade(df):
+    return (df["Year"] // 10 * 10).astype("int16")
+
+
+def _development_status(df):
+    income = df["Income Group"]
+    status = np.where(income.isin(DEVELOPED_INCOME_GROUPS), *DEVELOPMENT_STATUS_ORDER)
+    # Sin grupo de ingresos no hay estado de desarrollo (el notebook descarta esas filas)
+    return pd.Series(status, index=df.index).where(income.notna()).astype(pd.CategoricalDtype(DEVELOPMENT_STATUS_ORDER))
+
+
+def _gdp_range(df):
+    return pd.cut(df["GDP"], bins=5, labels=GDP_RANGE_LABELS)
+
+
+def _pib_rango(df):
+    return pd.cut(df["GDP"], bins=PIB_RANGO_BINS, labels=PIB_RANGO_LABELS)
+
+
+def _participation_per_million(df):
+    # Participaciones totales del país (filas por NOC) por millón de habitantes, como en el notebook
+    participations = df.groupby("NOC", observed=True)["NOC"].transform("size").astype(float)
+    return (participations / df["Population"] * 1e6).replace([np.inf, -np.inf], np.nan)
+
+
+# Variables derivadas en orden de cálculo: nombre -> Feature(columnas de entrada, cálculo, versión)
+FEATURES = {
+    "Sport Category": Feature(["Sport"], _sport_category, 1),
+    "Decade": Feature(["Year"], _decade, 1),
+    "Development Status": Feature(["Income Group"], _development_status, 1),
+    "GDP Range": Feature(["GDP"], _gdp_range, 1),
+    "PIB_Rango": Feature(["GDP"], _pib_rango, 1),
+    "Participation_Per_Million": Feature(["NOC", "Population"], _participation_per_million, 1),
+}
+
+
+def registry_digest(path=SPORT_CATEGORIES_CSV):
+    """
+    Huella del registro: versiones de las variables y contenido de la taxonomía de deportes.
+    """
+    digest = hashlib.sha256(json.dumps({name: feature.version for name, feature in FEATURES.items()}).encode("utf-8"))
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def add_features(df):
+    """
+    Devuelve una copia de `df` con las variables del registro cuyas columnas de entrada existen.
+    """
+    columns = {}
+    for name, feature in FEATURES.items():
+        if all(col in df.columns for col in feature.inputs):
+            columns[name] = feature.compute(df)
+    return df.assign(**columns)
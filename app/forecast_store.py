@@ -0,0 +1,230 @@
+import argparse
+import ast
+import hashlib
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import PAGES_DIR, _write_parquet, dataset_version, read_cube
+from forecasting import update_arima
+from medal_cube import MEDAL_TYPES, rollup
+
+# Almacén de predicciones por país (NOC) y por región, generado por este proceso por lotes:
+#   python app/forecast_store.py [--workers N] [--steps 5] [--update]
+FORECASTS_PARQUET = os.path.join(PAGES_DIR, "forecast_store.parquet")
+DIAGNOSTICS_PARQUET = os.path.join(PAGES_DIR, "forecast_store_diagnostics.parquet")
+
+# Niveles de agregación de las series: etiqueta -> columna del cubo
+LEVELS = {"NOC": "NOC", "Region": "Region"}
+# Mínimo de ediciones observadas para ajustar un modelo
+MIN_OBSERVATIONS = 8
+STORE_ORDER = (1, 1, 1)
+STORE_STEPS = 5
+STORE_ALPHA = 0.05
+
+
+def build_series(cube, level):
+    """
+    Construye las series anuales de medallas de cada país o región.
+    Cada serie cubre todas las ediciones desde la primera medalla del grupo, con 0 donde no ganó ninguna.
+    Devuelve una lista de (clave, años, medallas).
+    """
+    edition_years = np.sort(cube["Year"].unique()).astype(int)
+    medals = rollup(cube, [LEVELS[level], "Year"], where={"Medal": MEDAL_TYPES})
+    table = medals.pivot(index="Year", columns=LEVELS[level], values="count")
+    table = table.reindex(edition_years).fillna(0)
+
+    series = []
+    for key in table.columns:
+        values = table[key]
+        first_year = values.index[values.to_numpy() > 0].min()
+        values = values.loc[first_year:]
+        series.append((str(key), values.index.to_numpy(dtype=int), values.to_numpy(dtype=float)))
+    return series
+
+
+def series_hash(years, values, steps, alpha):
+    """
+    Hash de una serie (años y medallas) y de los parámetros de la predicción (pasos y alpha).
+    Si coincide con el guardado en los diagnósticos, la predicción del almacén sigue siendo válida.
+    """
+    digest = hashlib.sha256(np.asarray(years, dtype=np.int64).tobytes())
+    digest.update(np.asarray(values, dtype=np.float64).tobytes())
+    digest.update(f"{int(steps)}|{float(alpha)!r}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _summarize(level, key, years, values, result, steps, alpha, update):
+    # Predicciones con intervalos de confianza y diagnósticos de un ajuste
+    forecast = result.get_forecast(steps=steps)
+    interval = years[-1] - years[-2]
+    mean = np.asarray(forecast.predicted_mean)
+    bounds = np.asarray(forecast.conf_int(alpha=alpha))
+    rows = [
+        {
+            "Level": level,
+            "Key": key,
+            "Step": step + 1,
+            "Year": int(years[-1] + interval * (step + 1)),
+            "Forecast": mean[step],
+            "Lower": bounds[step, 0],
+            "Upper": bounds[step, 1],
+        }
+        for step in range(steps)
+    ]
+    converged = bool(result.mle_retvals.get("converged", True)) if result.mle_retvals else True
+    diagnostics = {
+        "Level": level,
+        "Key": key,
+        "Observations": len(values),
+        "Last Year": int(years[-1]),
+        "Series Hash": series_hash(years, values, steps, alpha),
+        "Status": "ok",
+        "Update": update,
+        "AIC": result.aic,
+        "BIC": result.bic,
+        "Converged": converged,
+        "Params": np.asarray(result.params, dtype=float).tolist(),
+    }
+    return rows, diagnostics
+
+
+def _fit_series(task):
+    # Se ejecuta en un proceso del pool: ajusta una serie y devuelve predicciones y diagnósticos.
+    # Si la serie ya estaba en el almacén (`prior` = observaciones y parámetros anteriores),
+    # solo se añaden las nuevas ediciones con forecasting.update_arima.
+    from statsmodels.tsa.arima.model import ARIMA
+
+    level, key, years, values, order, steps, alpha, prior = task
+    diagnostics = {
+        "Level": level, "Key": key, "Observations": len(values), "Last Year": int(years[-1]),
+        "Series Hash": series_hash(years, values, steps, alpha),
+    }
+    if len(values) < MIN_OBSERVATIONS:
+        return [], {**diagnostics, "Status": "insufficient"}
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if prior is not None and MIN_OBSERVATIONS <= prior[0] < len(values):
+                previous_n, params = prior
+                result = ARIMA(values[:previous_n], order=order).filter(np.asarray(params))
+                result, update = update_arima(result, values[previous_n:])
+            else:
+                result, update = ARIMA(values, order=order).fit(), "fit"
+            return _summarize(level, key, years, values, result, steps, alpha, update)
+    except Exception as e:
+        return [], {**diagnostics, "Status": "failed", "Error": str(e)}
+
+
+def _write_store(forecast_rows, diagnostics_rows, order):
+    forecasts = pd.DataFrame(forecast_rows, columns=["Level", "Key", "Step", "Year", "Forecast", "Lower", "Upper"])
+    forecasts = forecasts.astype({"Level": "category", "Key": "category", "Step": "int8", "Year": "int16"})
+    diagnostics = pd.DataFrame(diagnostics_rows)
+    diagnostics["Order"] = str(order)
+    diagnostics["Data Version"] = dataset_version()
+
+    # Escritura atómica, primero los diagnósticos y después las predicciones: la aplicación nunca lee
+    # un archivo a medias y la versión del almacén (store_version) cambia con cada uno de los dos
+    _write_parquet(diagnostics, DIAGNOSTICS_PARQUET)
+    _write_parquet(forecasts, FORECASTS_PARQUET)
+    return forecasts, diagnostics
+
+
+def _run_tasks(tasks, workers):
+    forecast_rows, diagnostics_rows = [], []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows, diagnostics in executor.map(_fit_series, tasks, chunksize=8):
+            forecast_rows.extend(rows)
+            diagnostics_rows.append(diagnostics)
+    return forecast_rows, diagnostics_rows
+
+
+def build_forecast_store(cube, workers=None, order=STORE_ORDER, steps=STORE_STEPS, alpha=STORE_ALPHA):
+    """
+    Ajusta un ARIMA por país y por región en un pool de procesos y escribe el almacén en disco.
+    Devuelve (predicciones, diagnósticos).
+    """
+    tasks = [
+        (level, key, years, values, order, steps, alpha, None)
+        for level in LEVELS
+        for key, years, values in build_series(cube, level)
+    ]
+    return _write_store(*_run_tasks(tasks, workers), order)
+
+
+def update_forecast_store(cube, workers=None, steps=STORE_STEPS, alpha=STORE_ALPHA):
+    """
+    Actualiza el almacén tras añadir nuevas ediciones al dataset. Las series sin cambios (mismo series_hash:
+    mismos valores, pasos y alpha) conservan sus predicciones, las demás reutilizan sus parámetros
+    (forecasting.update_arima) y solo las series nuevas o que fallaron se ajustan desde cero.
+    """
+    previous_forecasts = pd.read_parquet(FORECASTS_PARQUET)
+    previous = pd.read_parquet(DIAGNOSTICS_PARQUET)
+    order = ast.literal_eval(previous["Order"].iloc[0])
+    previous = previous.set_index(["Level", "Key"])
+
+    tasks, kept = [], set()
+    for level in LEVELS:
+        for key, years, values in build_series(cube, level):
+            prior = previous.loc[(level, key)] if (level, key) in previous.index else None
+            if prior is None or prior["Status"] != "ok":
+                tasks.append((level, key, years, values, order, steps, alpha, None))
+            elif prior.get("Series Hash") == series_hash(years, values, steps, alpha):
+                kept.add((level, key))
+            else:
+                tasks.append((level, key, years, values, order, steps, alpha, (int(prior["Observations"]), list(prior["Params"]))))
+
+    forecast_rows, diagnostics_rows = _run_tasks(tasks, workers)
+    is_kept = [(str(level), str(key)) in kept for level, key in zip(previous_forecasts["Level"], previous_forecasts["Key"])]
+    forecast_rows.extend(previous_forecasts[is_kept].to_dict("records"))
+    kept_diagnostics = previous[[index in kept for index in previous.index]].reset_index()
+    diagnostics_rows.extend(
+        {**row, "Update": "unchanged"}
+        for row in kept_diagnostics.drop(columns=["Order", "Data Version"]).to_dict("records")
+    )
+    return _write_store(forecast_rows, diagnostics_rows, order)
+
+
+def store_version():
+    """
+    Versión del almacén en disco (fechas de modificación de los dos archivos), o None si todavía no se ha generado.
+    """
+    if not (os.path.exists(FORECASTS_PARQUET) and os.path.exists(DIAGNOSTICS_PARQUET)):
+        return None
+    return f"{os.stat(DIAGNOSTICS_PARQUET).st_mtime_ns}-{os.stat(FORECASTS_PARQUET).st_mtime_ns}"
+
+
+@st.cache_resource(max_entries=1)
+def _load_forecast_store(version):
+    return pd.read_parquet(FORECASTS_PARQUET), pd.read_parquet(DIAGNOSTICS_PARQUET)
+
+
+def load_forecast_store():
+    """
+    Devuelve (predicciones, diagnósticos) del almacén, o None si no existe.
+    """
+    version = store_version()
+    if version is None:
+        return None
+    return _load_forecast_store(version)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula las predicciones ARIMA por país y región.")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--steps", type=int, default=STORE_STEPS, help="Ediciones a predecir")
+    parser.add_argument("--update", action="store_true", help="Actualizar el almacén existente en lugar de reconstruirlo")
+    args = parser.parse_args()
+
+    if args.update and store_version() is not None:
+        forecasts, diagnostics = update_forecast_store(read_cube(), workers=args.workers, steps=args.steps)
+        print(diagnostics["Update"].value_counts().to_string())
+    else:
+        forecasts, diagnostics = build_forecast_store(read_cube(), workers=args.workers, steps=args.steps)
+        print(diagnostics["Status"].value_counts().to_string())
+    print(f"Predicciones guardadas en {FORECASTS_PARQUET}")
@@ -0,0 +1,138 @@
+import argparse
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from model_registry import artifact_digest, load_artifact
+
+# Modelo ARIMA entrenado en el notebook sobre el total de medallas por año (todas las ediciones)
+ARIMA_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages", "arima_model.pkl")
+# Orden del modelo ARIMA usado en el notebook y en la página de predicción
+ARIMA_ORDER = (1, 1, 1)
+# Sin componente estacional (P, D, Q, s)
+NO_SEASONAL_ORDER = (0, 0, 0, 0)
+# Número máximo de ajustes en memoria; al superarlo se descarta el usado hace más tiempo (LRU)
+MAX_CACHED_FITS = 32
+# Error estandarizado a partir del cual las nuevas observaciones obligan a reajustar los parámetros
+UPDATE_Z_THRESHOLD = 3.0
+
+
+def filter_signature(years, medal_type, regions):
+    """
+    Clave de los filtros de la página ARIMA: rango de años, tipo de medalla y regiones ordenadas.
+    """
+    return int(years[0]), int(years[1]), medal_type, tuple(sorted(str(region) for region in regions))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_FITS, show_spinner="Ajustando el modelo ARIMA...")
+def fit_arima(signature, data_version, _series, order=ARIMA_ORDER, seasonal_order=NO_SEASONAL_ORDER):
+    """
+    Ajusta el modelo ARIMA sobre la serie de medallas, una sola vez por combinación de filtros, orden
+    y versión del dataset. El resultado se comparte entre sesiones y sirve para cualquier horizonte.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    return ARIMA(_series.reset_index(drop=True), order=order, seasonal_order=seasonal_order).fit()
+
+
+def get_arima_fit(signature, data_version, series, artifact_signature, order=ARIMA_ORDER, seasonal_order=NO_SEASONAL_ORDER):
+    """
+    Devuelve el ajuste ARIMA para la serie filtrada y si procede del modelo guardado.
+    Si los filtros y el orden coinciden con los del entrenamiento del notebook (`artifact_signature`)
+    y la serie es la misma con la que se entrenó, se sirve arima_model.pkl sin ajustar nada.
+    """
+    if signature == artifact_signature and order == ARIMA_ORDER and seasonal_order == NO_SEASONAL_ORDER:
+        artifact = load_artifact(ARIMA_ARTIFACT_PATH)
+        if np.array_equal(np.asarray(artifact.model.endog, dtype=float).ravel(), series.to_numpy(dtype=float)):
+            return artifact, True
+    return fit_arima(signature, data_version, series, order, seasonal_order), False
+
+
+def forecast_years(years, steps):
+    """
+    Años de las próximas `steps` ediciones, con el intervalo entre las dos últimas ediciones observadas.
+    """
+    years = sorted(int(year) for year in years)
+    interval = years[-1] - years[-2] if len(years) > 1 else 1
+    return [years[-1] + interval * i for i in range(1, steps + 1)]
+
+
+@st.cache_data(show_spinner=False)
+def _artifact_forecast(digest, years, steps):
+    forecast = load_artifact(ARIMA_ARTIFACT_PATH).forecast(steps=steps)
+    return pd.DataFrame({
+        "Año": forecast_years(years, steps),
+        "Predicción de Medallas": np.asarray(forecast).round().astype(int)
+    })
+
+
+def artifact_forecast(years, steps=5):
+    """
+    Predicción del modelo guardado para las próximas ediciones (cacheada por versión del archivo).
+    years: años de la serie con la que se entrenó el modelo.
+    """
+    return _artifact_forecast(artifact_digest(ARIMA_ARTIFACT_PATH), tuple(int(year) for year in years), steps)
+
+
+def _converged(result):
+    return bool(result.mle_retvals.get("converged", True)) if getattr(result, "mle_retvals", None) else True
+
+
+def update_arima(result, new_values, z_threshold=UPDATE_Z_THRESHOLD):
+    """
+    Añade nuevas observaciones (p. ej. una nueva edición) a un ajuste ARIMA ya existente.
+    - Si las nuevas observaciones caen dentro de lo que predecía el modelo (|z| <= z_threshold),
+      se reutilizan los parámetros y solo se filtran los datos nuevos.
+    - Si no, se reajusta partiendo de los parámetros anteriores (arranque en caliente).
+    - Si ese reajuste falla o no converge, se reajusta desde cero.
+    Devuelve (nuevo ajuste, modo de actualización).
+    """
+    new_values = np.asarray(new_values, dtype=float)
+    row_labels = result.model.data.row_labels
+    if isinstance(row_labels, pd.RangeIndex):
+        # La serie original tenía índice por posición: las nuevas observaciones lo continúan
+        start = row_labels.stop
+        new_values = pd.Series(new_values, index=pd.RangeIndex(start, start + len(new_values)))
+
+    forecast = result.get_forecast(steps=len(new_values))
+    z_scores = (np.asarray(new_values) - np.asarray(forecast.predicted_mean)) / np.sqrt(np.asarray(forecast.var_pred_mean))
+    updated = result.append(new_values, refit=False)
+    if np.all(np.abs(z_scores) <= z_threshold):
+        return updated, "append"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            refit = updated.model.fit(start_params=result.params)
+            if _converged(refit):
+                return refit, "warm_refit"
+        except Exception:
+            pass
+        return updated.model.fit(), "full_refit"
+
+
+def update_arima_artifact(new_values, path=ARIMA_ARTIFACT_PATH):
+    """
+    Actualiza arima_model.pkl con las observaciones de las nuevas ediciones y lo guarda en su sitio.
+    """
+    with open(path, "rb") as f:
+        result = pickle.load(f)
+    updated, mode = update_arima(result, new_values)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(updated, f)
+    os.replace(tmp_path, path)
+    return updated, mode
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Añade nuevas ediciones al modelo ARIMA guardado (arima_model.pkl).")
+    parser.add_argument("medals", type=float, nargs="+", help="Total de medallas de cada nueva edición, en orden")
+    args = parser.parse_args()
+
+    updated, mode = update_arima_artifact(args.medals)
+    print(f"Modelo actualizado ({mode}) con {int(updated.nobs)} observaciones: {ARIMA_ARTIFACT_PATH}")
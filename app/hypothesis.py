@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from medal_cube import rollup
+
+# Remuestreos por defecto, a partir de cuántos se reparten entre procesos y celdas máximas de cada matriz de remuestreo
+N_RESAMPLES = 5000
+PARALLEL_THRESHOLD = 20_000
+MAX_MATRIX_CELLS = 2_000_000
+CONFIDENCE = 0.95
+# Tamaño mínimo de muestra (países) para calcular los tests
+MIN_SAMPLE = 3
+RESULT_COLUMNS = ["Statistic", "Estimate", "p-value", "CI Low", "CI High", "Permutation p-value"]
+
+
+def _centered(M):
+    return M - M.mean(axis=1, keepdims=True)
+
+
+def _pearson_rows(X, Y):
+    Xc, Yc = _centered(X), _centered(Y)
+    return (Xc * Yc).sum(axis=1) / np.sqrt((Xc ** 2).sum(axis=1) * (Yc ** 2).sum(axis=1))
+
+
+def _spearman_rows(X, Y):
+    from scipy import stats
+
+    return _pearson_rows(stats.rankdata(X, axis=1), stats.rankdata(Y, axis=1))
+
+
+def _slope_rows(X, Y):
+    Xc = _centered(X)
+    return (Xc * _centered(Y)).sum(axis=1) / (Xc ** 2).sum(axis=1)
+
+
+def _intercept_rows(X, Y):
+    return Y.mean(axis=1) - _slope_rows(X, Y) * X.mean(axis=1)
+
+
+# Estadísticos calculados por filas sobre matrices (remuestreo, observación)
+STATISTICS = {
+    "pearson": _pearson_rows,
+    "spearman": _spearman_rows,
+    "slope": _slope_rows,
+    "intercept": _intercept_rows,
+    "r_squared": lambda X, Y: _pearson_rows(X, Y) ** 2,
+}
+# Estadísticos que miden dependencia entre x e y (el test de permutación solo tiene sentido para ellos)
+PERMUTATION_STATISTICS = {"pearson", "spearman", "slope", "r_squared"}
+
+
+def _resample_chunk(task):
+    # Se ejecuta en el proceso actual o en uno del pool: un bloque de remuestreos con su propia semilla.
+    # Cada bloque se evalúa como matrices de como mucho MAX_MATRIX_CELLS celdas.
+    x, y, names, kind, n_resamples, seed = task
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    rows = max(1, MAX_MATRIX_CELLS // n)
+    results = {name: [] for name in names}
+    for start in range(0, n_resamples, rows):
+        size = min(rows, n_resamples - start)
+        if kind == "bootstrap":
+            # Pares (x, y) remuestreados con reemplazo
+            idx = rng.integers(0, n, (size, n))
+            X, Y = x[idx], y[idx]
+        else:
+            # Permutaciones de y con x fijo (hipótesis nula de independencia)
+            X = np.broadcast_to(x, (size, n))
+            Y = y[np.argsort(rng.random((size, n)), axis=1)]
+        for name in names:
+            results[name].append(STATISTICS[name](X, Y))
+    return {name: np.concatenate(values) for name, values in results.items()}
+
+
+@st.cache_resource
+def _resample_executor():
+    # Un solo pool de procesos por servidor, compartido por todas las sesiones y reutilizado entre ejecuciones
+    return ProcessPoolExecutor()
+
+
+def resample_statistics(x, y, names, kind="bootstrap", n_resamples=N_RESAMPLES, seed=0):
+    """
+    Distribución de los estadísticos `names` sobre `n_resamples` remuestreos ("bootstrap" o "permutation").
+    Con muchos remuestreos, los bloques se reparten entre los procesos del pool con semillas independientes.
+    Devuelve un diccionario estadístico -> array de valores.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if n_resamples < PARALLEL_THRESHOLD:
+        return _resample_chunk((x, y, names, kind, n_resamples, seed))
+
+    n_chunks = -(-n_resamples // PARALLEL_THRESHOLD)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [PARALLEL_THRESHOLD] * (n_chunks - 1) + [n_resamples - PARALLEL_THRESHOLD * (n_chunks - 1)]
+    tasks = [(x, y, names, kind, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    chunks = list(_resample_executor().map(_resample_chunk, tasks))
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in names}
+
+
+def _parametric_p_values(x, y):
+    # p-valores clásicos (los del notebook): Pearson, Spearman y la regresión lineal
+    from scipy import stats
+
+    pearson_p = stats.pearsonr(x, y)[1]
+    regression_p = stats.linregress(x, y).pvalue
+    return {
+        "pearson": pearson_p,
+        "spearman": stats.spearmanr(x, y)[1],
+        "slope": regression_p,
+        "intercept": np.nan,
+        "r_squared": regression_p,
+    }
+
+
+def hypothesis_test(x, y, names, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Estimación, p-valor clásico, intervalo de confianza bootstrap (percentiles) y p-valor de permutación
+    de cada estadístico. Devuelve un DataFrame con RESULT_COLUMNS.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    estimates = {name: STATISTICS[name](x[None, :], y[None, :])[0] for name in names}
+    p_values = _parametric_p_values(x, y)
+    bootstrap = resample_statistics(x, y, names, "bootstrap", n_resamples, seed)
+    permuted = [name for name in names if name in PERMUTATION_STATISTICS]
+    null = resample_statistics(x, y, permuted, "permutation", n_resamples, seed + 1) if permuted else {}
+
+    alpha = 1 - confidence
+    rows = []
+    for name in names:
+        low, high = np.nanquantile(bootstrap[name], [alpha / 2, 1 - alpha / 2])
+        permutation_p = np.nan
+        if name in null:
+            extreme = np.abs(null[name]) >= np.abs(estimates[name])
+            permutation_p = (1 + extreme.sum()) / (1 + len(extreme))
+        rows.append([name, estimates[name], p_values[name], low, high, permutation_p])
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+@st.cache_data(max_entries=64, show_spinner="Calculando los tests de hipótesis...")
+def slice_tests(_cube, data_version, where, n_resamples=N_RESAMPLES):
+    """
+    Tests de hipótesis de la página CDA sobre un subconjunto del cubo (where de medal_cube.rollup),
+    cacheados por subconjunto, versión del dataset y número de remuestreos:
+    - "gdp": correlaciones de Pearson y Spearman entre el PIB medio de cada país y sus participaciones;
+    - "population": regresión lineal de los atletas enviados por cada país sobre su población media.
+    Cada resultado es un DataFrame (o None si hay menos de MIN_SAMPLE países) junto al número de países.
+    """
+    results = {}
+    for key, measure, names in [
+        ("gdp", "GDP", ["pearson", "spearman"]),
+        ("population", "Population", ["slope", "intercept", "r_squared"]),
+    ]:
+        by_country = rollup(_cube, ["NOC"], where=where, measures=[measure]).dropna(subset=[measure])
+        table = None
+        if len(by_country) >= MIN_SAMPLE:
+            table = hypothesis_test(by_country[measure], by_country["count"], names, n_resamples)
+        results[key] = (table, len(by_country))
+    return results
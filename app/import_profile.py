@@ -0,0 +1,105 @@
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+# Informe del tiempo de importación de cada página (como `python -X importtime`, pero por página):
+#   python app/import_profile.py [--output informe.json] [--baseline informe_anterior.json]
+# Cada página se mide en un intérprete nuevo, que es lo que paga un proceso de Streamlit recién arrancado.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES = [os.path.join(APP_DIR, "app.py")] + sorted(glob.glob(os.path.join(APP_DIR, "pages", "*.py")))
+# Dependencias pesadas que las páginas solo deben importar en el código que las usa
+HEAVY_MODULES = ["statsmodels", "sklearn", "xgboost", "fpdf", "matplotlib"]
+# Aumento relativo del tiempo respecto al informe anterior a partir del cual se marca una regresión
+REGRESSION_TOLERANCE = 0.2
+
+
+def page_imports(path):
+    """
+    Sentencias import del nivel superior de una página (lo que se ejecuta al abrirla).
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _importtime(code):
+    # Ejecuta `code` con -X importtime y devuelve {módulo: (nivel, microsegundos acumulados)}
+    env = {**os.environ, "PYTHONPATH": APP_DIR}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        level = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (level, int(cumulative))
+    return modules
+
+
+def profile_page(path, startup):
+    """
+    Mide las importaciones de una página en un intérprete nuevo, sin contar las del propio arranque de Python.
+    Devuelve un diccionario con el tiempo total, el número de módulos, las dependencias pesadas y los más lentos.
+    """
+    modules = {name: timing for name, timing in _importtime("\n".join(page_imports(path))).items() if name not in startup}
+    top_level = {name: us for name, (level, us) in modules.items() if level == 0}
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:3]
+    return {
+        "Page": os.path.relpath(path, APP_DIR),
+        "Import ms": round(sum(top_level.values()) / 1000, 1),
+        "Modules": len(modules),
+        "Heavy": ", ".join(sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))),
+        "Slowest": ", ".join(f"{name} ({us / 1000:.0f} ms)" for name, us in slowest),
+    }
+
+
+def import_report(pages=PAGES):
+    """
+    Informe de importaciones de todas las páginas como DataFrame.
+    """
+    startup = set(_importtime("pass"))
+    return pd.DataFrame([profile_page(path, startup) for path in pages])
+
+
+def compare_with_baseline(report, baseline, tolerance=REGRESSION_TOLERANCE):
+    """
+    Añade el tiempo del informe anterior y marca las páginas que han empeorado más de `tolerance`
+    o que importan dependencias pesadas nuevas.
+    """
+    previous = baseline.set_index("Page")
+    report = report.copy()
+    report["Baseline ms"] = report["Page"].map(previous["Import ms"])
+    new_heavy = [
+        set(filter(None, heavy.split(", "))) - set(filter(None, str(previous["Heavy"].get(page) or "").split(", ")))
+        for page, heavy in zip(report["Page"], report["Heavy"])
+    ]
+    report["Regression"] = (report["Import ms"] > report["Baseline ms"] * (1 + tolerance)) | [bool(heavy) for heavy in new_heavy]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de importación de cada página de la aplicación.")
+    parser.add_argument("--output", help="Guardar el informe en JSON")
+    parser.add_argument("--baseline", help="Informe JSON anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="Aumento relativo tolerado")
+    args = parser.parse_args()
+
+    report = import_report()
+    if args.baseline:
+        report = compare_with_baseline(report, pd.read_json(args.baseline), args.tolerance)
+    print(report.to_string(index=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict("records"), f, indent=2, ensure_ascii=False)
+    if args.baseline and report["Regression"].any():
+        sys.exit(1)
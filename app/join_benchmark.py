@@ -0,0 +1,71 @@
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+import pandas as pd
+
+from pipeline import BUILD_DIR, join_sources, merge_sources
+
+# Compara el tiempo y la memoria de pico de la unión por claves enteras (join_sources)
+# con la cadena de merges del notebook (merge_sources), sobre las etapas ya generadas por pipeline.py:
+#   python app/join_benchmark.py [--build-dir DIR] [--repeat 5]
+SOURCES = ["athletes", "metadata", "gdp", "population", "temperature"]
+JOINS = {"merge_sources": merge_sources, "join_sources": join_sources}
+
+
+def load_sources(build_dir=BUILD_DIR):
+    """
+    Lee los resultados intermedios de las etapas que alimentan la unión final.
+    """
+    return [pd.read_parquet(os.path.join(build_dir, f"{name}.parquet")) for name in SOURCES]
+
+
+def measure(join, sources, repeat):
+    """
+    Ejecuta `join` `repeat` veces y devuelve (mediana de segundos, pico de memoria en MB, resultado).
+    El pico se mide aparte con tracemalloc para que el rastreo no afecte a los tiempos.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = join(*sources)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    join(*sources)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1e6, result
+
+
+def same_result(left, right):
+    """
+    Comprueba que las dos uniones producen el mismo dataset (mismas columnas y valores, sin mirar tipos).
+    """
+    def plain(frame):
+        frame = frame.reset_index(drop=True)
+        return frame.astype({col: object for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)})
+
+    try:
+        pd.testing.assert_frame_equal(plain(left), plain(right), check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara la unión por claves enteras con la cadena de merges.")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="Carpeta con los resultados intermedios de pipeline.py")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones para medir el tiempo")
+    args = parser.parse_args()
+
+    sources = load_sources(args.build_dir)
+    rows, results = [], {}
+    for name, join in JOINS.items():
+        seconds, peak_mb, results[name] = measure(join, sources, args.repeat)
+        rows.append({"Join": name, "Seconds": round(seconds, 4), "Peak MB": round(peak_mb, 1)})
+
+    print(pd.DataFrame(rows).to_string(index=False))
+    print(f"Mismo resultado: {same_result(*results.values())}")
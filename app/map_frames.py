@@ -0,0 +1,70 @@
+import plotly.express as px
+import streamlit as st
+
+from charts import figure_size
+from country_codes import load_country_codes, map_country_codes
+from medal_cube import rollup
+
+# Presupuesto del mapa animado: tamaño de la figura que se envía al navegador y memoria de los frames.
+# Si se supera, la página vuelve al mapa de una sola edición.
+FRAME_PAYLOAD_BUDGET = 8_000_000
+FRAME_MEMORY_BUDGET = 50_000_000
+VALUE_COLUMN = "Número de Medallas"
+
+
+def medal_frames(cube, season, medal_types):
+    """
+    Medallas por edición y país (ISO-3) de una temporada, con todas las ediciones en una sola tabla.
+    Devuelve (tabla, NOC sin código ISO-3).
+    """
+    counts = rollup(cube, ["Year", "NOC"], where={"Season": season, "Medal": list(medal_types)})
+    counts = counts.rename(columns={"count": VALUE_COLUMN})
+    frames, unmapped = map_country_codes(counts, load_country_codes(), VALUE_COLUMN, by=["Year"])
+    return frames.sort_values(["Year", "ISO3"]).reset_index(drop=True), unmapped
+
+
+def check_frame_budget(fig, frames, payload_budget=FRAME_PAYLOAD_BUDGET, memory_budget=FRAME_MEMORY_BUDGET):
+    """
+    Comprueba el tamaño serializado de la figura animada y la memoria de sus datos frente a los presupuestos.
+    """
+    payload_bytes = figure_size(fig)
+    memory_bytes = int(frames.memory_usage(deep=True).sum())
+    return {
+        "payload_bytes": payload_bytes,
+        "memory_bytes": memory_bytes,
+        "within_budget": payload_bytes <= payload_budget and memory_bytes <= memory_budget,
+    }
+
+
+@st.cache_data(max_entries=16, show_spinner="Preparando el mapa de todas las ediciones...")
+def animated_medal_map(_cube, data_version, season, medal_types):
+    """
+    Choropleth con un frame por edición y un deslizador de años: recorrer las ediciones ocurre en el navegador,
+    sin volver a ejecutar la página. Se cachea por versión del dataset, temporada y tipos de medalla.
+    Devuelve (figura, NOC sin código ISO-3, resultado de check_frame_budget).
+    """
+    frames, unmapped = medal_frames(_cube, season, medal_types)
+    fig = px.choropleth(
+        frames,
+        locations="ISO3",
+        color=VALUE_COLUMN,
+        hover_name="Country",
+        hover_data=[VALUE_COLUMN, "NOC"],
+        animation_frame="Year",
+        # Misma escala de color en todos los frames para que las ediciones sean comparables
+        range_color=(0, frames[VALUE_COLUMN].max() if not frames.empty else 1),
+        title=f"Medallas por País - {season}",
+        color_continuous_scale="Viridis",
+        projection="natural earth"
+    )
+    fig.update_layout(
+        geo=dict(
+            showframe=False,
+            showcoastlines=True,
+            coastlinecolor="LightGray",
+            projection_type="natural earth"
+        ),
+        width=1000,
+        height=700
+    )
+    return fig, unmapped, check_frame_budget(fig, frames)
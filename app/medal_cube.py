@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Dimensiones y medidas del cubo de agregados. Las variables derivadas (ver features) dependen de otras
+# dimensiones (Sport, Year, Income Group, NOC y Year para el PIB), así que no aumentan el número de celdas
+CUBE_KEYS = [
+    "Year", "Season", "NOC", "Sport", "Medal", "Region", "Income Group",
+    "Sport Category", "Decade", "Development Status", "GDP Range", "PIB_Rango",
+]
+CUBE_MEASURES = ["GDP", "Population", "Annual Anomaly", "Monthly Anomaly"]
+
+# Valores de "Medal" que cuentan como medalla ganada (el resto es "No Medal")
+MEDAL_TYPES = ["Gold", "Silver", "Bronze"]
+
+
+def build_cube(df):
+    """
+    Construye el cubo de agregados a partir del dataset a nivel de atleta.
+    Cada celda es una combinación de CUBE_KEYS con el número de filas ("count")
+    y, para cada medida, la suma ("<medida>_sum") y el número de valores no nulos ("<medida>_n").
+    """
+    keys = [col for col in CUBE_KEYS if col in df.columns]
+    measures = [col for col in CUBE_MEASURES if col in df.columns]
+
+    grouped = df.groupby(keys, observed=True, dropna=False, sort=False)
+    cube = grouped[measures].agg(["sum", "count"])
+    cube.columns = [f"{measure}_{'sum' if stat == 'sum' else 'n'}" for measure, stat in cube.columns]
+    cube.insert(0, "count", grouped.size().astype("int32"))
+    return cube.reset_index()
+
+
+def cube_fields(cube):
+    """
+    Columnas del dataset original representadas en el cubo (dimensiones y medidas).
+    """
+    keys = [col for col in CUBE_KEYS if col in cube.columns]
+    measures = [col for col in CUBE_MEASURES if f"{col}_sum" in cube.columns]
+    return set(keys + measures)
+
+
+def cell_mean(cube, measure):
+    """
+    Media de una medida en cada celda del cubo (p. ej. el PIB de cada país y año).
+    """
+    return cube[f"{measure}_sum"] / cube[f"{measure}_n"]
+
+
+def filter_cells(cube, where=None):
+    """
+    Filtra las celdas del cubo.
+    where: diccionario columna -> valor, lista de valores o tupla (mínimo, máximo) inclusiva,
+    donde cualquiera de los extremos puede ser None.
+    """
+    if not where:
+        return cube
+
+    mask = np.ones(len(cube), dtype=bool)
+    for column, value in where.items():
+        values = cube[column]
+        if isinstance(value, tuple):
+            low, high = value
+            if low is not None:
+                mask &= (values >= low).to_numpy()
+            if high is not None:
+                mask &= (values <= high).to_numpy()
+        elif isinstance(value, (list, set, np.ndarray, pd.Index, pd.Series)):
+            mask &= values.isin(list(value)).to_numpy()
+        else:
+            mask &= (values == value).to_numpy()
+    return cube[mask]
+
+
+def rollup(cube, by, where=None, measures=(), observed=True):
+    """
+    Agrega el cubo por las columnas de `by` tras aplicar los filtros de `where` (ver filter_cells).
+    `by` admite nombres de columna o Series alineadas con el cubo (claves derivadas).
+    Devuelve las claves, "count" (número de filas del dataset) y la media de cada medida.
+    """
+    cells = filter_cells(cube, where)
+    keys = [key.loc[cells.index] if isinstance(key, pd.Series) else key for key in by]
+    value_columns = ["count"] + [f"{measure}_{stat}" for measure in measures for stat in ("sum", "n")]
+
+    totals = cells.groupby(keys, observed=observed)[value_columns].sum()
+    for measure in measures:
+        totals[measure] = totals[f"{measure}_sum"] / totals[f"{measure}_n"]
+    return totals[["count", *measures]].reset_index()
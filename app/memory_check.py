@@ -0,0 +1,80 @@
+import argparse
+import gc
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from report import medals_over_time_png, top_countries_png
+
+# Comprueba que generar los gráficos de la página de conclusiones no hace crecer la memoria del proceso:
+#   python app/memory_check.py [--reruns 2000] [--max-growth-mb 5]
+# Cada "ejecución" genera los dos PNG sin caché (el peor caso: la caché de report.chart_images vacía).
+RERUNS = 2000
+WARMUP = 50
+MAX_GROWTH_MB = 5.0
+
+
+def _rss_mb():
+    # Memoria residente actual del proceso (Linux); en macOS, el pico (ru_maxrss va en bytes)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        import resource
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / 1e6 if sys.platform == "darwin" else max_rss / 1e3
+
+
+def sample_series():
+    """
+    Series con la forma de las de la página: top 10 de países y número de filas por año.
+    """
+    rng = np.random.default_rng(0)
+    top = pd.Series(rng.integers(1000, 10000, 10), index=[f"N{i:02d}" for i in range(10)]).sort_values(ascending=False)
+    by_year = pd.Series(rng.integers(500, 15000, 35), index=range(1896, 2036, 4))
+    return top, by_year
+
+
+def memory_growth(reruns=RERUNS, warmup=WARMUP):
+    """
+    Genera los gráficos `reruns` veces y devuelve (memoria tras el calentamiento, memoria final) en MB.
+    """
+    top, by_year = sample_series()
+    for _ in range(warmup):
+        top_countries_png(top)
+        medals_over_time_png(by_year)
+    gc.collect()
+    baseline = _rss_mb()
+    for _ in range(reruns):
+        top_countries_png(top)
+        medals_over_time_png(by_year)
+    gc.collect()
+    final = _rss_mb()
+    return baseline, final
+
+
+def open_pyplot_figures():
+    """
+    Figuras abiertas en pyplot (deben ser 0: los gráficos no usan pyplot).
+    """
+    if "matplotlib.pyplot" not in sys.modules:
+        return 0
+    return len(sys.modules["matplotlib.pyplot"].get_fignums())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crecimiento de memoria al generar los gráficos de conclusiones.")
+    parser.add_argument("--reruns", type=int, default=RERUNS, help="Ejecuciones simuladas")
+    parser.add_argument("--max-growth-mb", type=float, default=MAX_GROWTH_MB, help="Crecimiento máximo tolerado")
+    args = parser.parse_args()
+
+    baseline, final = memory_growth(args.reruns)
+    figures = open_pyplot_figures()
+    print(f"Memoria tras el calentamiento: {baseline:.1f} MB · tras {args.reruns} ejecuciones: {final:.1f} MB")
+    print(f"Figuras de pyplot abiertas: {figures}")
+    if final - baseline > args.max_growth_mb or figures:
+        print(f"La memoria ha crecido {final - baseline:.1f} MB (máximo {args.max_growth_mb} MB)")
+        sys.exit(1)
@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import os
+import pickle
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+# Artefactos del modelo de participación entrenado en el notebook
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+MODEL_PATH = os.path.join(PAGES_DIR, "xgboost_model.pkl")
+SCALER_PATH = os.path.join(PAGES_DIR, "nuevo_scaler.pkl")
+
+# Variables de entrada del modelo (en el orden en que se ajustó el escalador)
+PARTICIPATION_FEATURES = ["GDP", "Population", "Annual Anomaly", "Monthly Anomaly", "Participation_Per_Million"]
+# Valores por defecto de las variables que el simulador no expone
+DEFAULT_FEATURES = {"Monthly Anomaly": 0.1, "Participation_Per_Million": 0.5}
+# Escenario de calentamiento (el mismo ejemplo que se usa en el notebook)
+WARMUP_SCENARIO = {"GDP": 1.5e12, "Population": 1.5e9, "Annual Anomaly": 0.5, **DEFAULT_FEATURES}
+
+ParticipationModel = namedtuple("ParticipationModel", ["scaler", "model"])
+
+
+@functools.lru_cache(maxsize=32)
+def _file_digest(path, mtime_ns, size):
+    # Solo se vuelve a leer el archivo cuando cambian su fecha de modificación o su tamaño
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def artifact_digest(path):
+    """
+    Hash SHA-256 del contenido de un artefacto.
+    """
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_artifact(path, digest):
+    # La clave incluye el hash: un archivo con el mismo contenido nunca se vuelve a deserializar
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_artifact(path):
+    """
+    Devuelve el objeto serializado en `path`, deserializado una sola vez por proceso
+    y compartido entre sesiones. Se recarga solo si cambia el contenido del archivo.
+    """
+    return _load_artifact(path, artifact_digest(path))
+
+
+def predict_participation(participation_model, scenarios):
+    """
+    Predice la participación para un DataFrame de escenarios con las columnas de PARTICIPATION_FEATURES.
+    """
+    scaled_data = participation_model.scaler.transform(scenarios[PARTICIPATION_FEATURES])
+    return participation_model.model.predict(scaled_data)
+
+
+@st.cache_resource(max_entries=2, show_spinner="Cargando el modelo predictivo...")
+def _warm_participation_model(model_digest, scaler_digest):
+    participation_model = ParticipationModel(
+        scaler=_load_artifact(SCALER_PATH, scaler_digest),
+        model=_load_artifact(MODEL_PATH, model_digest),
+    )
+    # Predicción de calentamiento: la primera llamada a predict inicializa estructuras internas de XGBoost
+    predict_participation(participation_model, pd.DataFrame([WARMUP_SCENARIO]))
+    return participation_model
+
+
+def participation_model_key():
+    """
+    Versión del modelo de participación (hashes del modelo y del escalador), útil como clave de caché.
+    """
+    return artifact_digest(MODEL_PATH), artifact_digest(SCALER_PATH)
+
+
+def load_participation_model():
+    """
+    Devuelve el escalador y el modelo XGBoost listos para predecir (ya calentados).
+    """
+    return _warm_participation_model(*participation_model_key())
@@ -0,0 +1,99 @@
+import itertools
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from forecasting import ARIMA_ORDER, NO_SEASONAL_ORDER
+
+# Rejilla de órdenes (p, d, q) candidatos
+ORDER_GRID = {"p": range(0, 4), "d": range(0, 3), "q": range(0, 4)}
+# Ciclo olímpico en ediciones: desde 1994 los Juegos de verano e invierno se alternan cada dos años
+OLYMPIC_CYCLE = 2
+SEASONAL_GRID = [(P, D, Q, OLYMPIC_CYCLE) for P, D, Q in itertools.product((0, 1), repeat=3)]
+# Observaciones mínimas por parámetro estimado (los candidatos que no las cumplen se descartan sin ajustar)
+MIN_OBSERVATIONS_PER_PARAM = 3
+# Ronda rápida con pocas iteraciones: los candidatos peores que el mejor + PRUNE_DELTA no pasan a la ronda completa
+QUICK_MAXITER = 10
+FULL_MAXITER = 200
+PRUNE_DELTA = 10.0
+RANKING_COLUMNS = ["p", "d", "q", "P", "D", "Q", "s", "Score", "Converged"]
+
+
+def candidate_orders(n_observations, seasonal=False):
+    """
+    Lista de (orden, orden estacional) a evaluar, sin los modelos con demasiados parámetros para la serie.
+    """
+    seasonal_orders = SEASONAL_GRID if seasonal else [NO_SEASONAL_ORDER]
+    candidates = []
+    for order in itertools.product(*ORDER_GRID.values()):
+        for seasonal_order in seasonal_orders:
+            p, d, q = order
+            P, D, Q, s = seasonal_order
+            n_params = p + q + P + Q + 1
+            usable = n_observations - d - D * s
+            if usable >= MIN_OBSERVATIONS_PER_PARAM * n_params:
+                candidates.append((order, seasonal_order))
+    return candidates
+
+
+def _evaluate(task):
+    # Se ejecuta en un proceso del pool: ajusta un candidato y devuelve su criterio de información
+    from statsmodels.tsa.arima.model import ARIMA
+
+    values, order, seasonal_order, maxiter, criterion = task
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = ARIMA(values, order=order, seasonal_order=seasonal_order).fit(method_kwargs={"maxiter": maxiter})
+    except Exception:
+        return (*order, *seasonal_order, np.inf, False)
+
+    score = float(getattr(result, criterion))
+    converged = bool(result.mle_retvals.get("converged", True)) if result.mle_retvals else True
+    return (*order, *seasonal_order, score, converged and np.isfinite(score))
+
+
+def search_order(values, criterion="aic", seasonal=False, workers=None):
+    """
+    Evalúa la rejilla de órdenes en paralelo y devuelve el ranking (mejor primero) de los candidatos
+    que convergen. Ronda rápida con pocas iteraciones para podar los dominados y ronda completa para el resto.
+    """
+    values = np.asarray(values, dtype=float)
+    candidates = candidate_orders(len(values), seasonal)
+    if not candidates:
+        return pd.DataFrame(columns=RANKING_COLUMNS)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        quick = list(executor.map(
+            _evaluate, [(values, order, seasonal_order, QUICK_MAXITER, criterion) for order, seasonal_order in candidates]
+        ))
+        # Los ajustes que fallan o no convergen en la ronda rápida no se vuelven a ajustar
+        converged = [(candidate, row[-2]) for candidate, row in zip(candidates, quick) if row[-1]]
+        if not converged:
+            return pd.DataFrame(columns=RANKING_COLUMNS)
+        best_quick = min(score for _, score in converged)
+        survivors = [candidate for candidate, score in converged if score <= best_quick + PRUNE_DELTA]
+        full = list(executor.map(
+            _evaluate, [(values, order, seasonal_order, FULL_MAXITER, criterion) for order, seasonal_order in survivors]
+        ))
+
+    ranking = pd.DataFrame(full, columns=RANKING_COLUMNS).astype({"Converged": bool})
+    return ranking[ranking["Converged"]].sort_values("Score").reset_index(drop=True)
+
+
+@st.cache_data(max_entries=64, show_spinner="Buscando el mejor orden ARIMA...")
+def select_order(signature, data_version, _values, criterion="aic", seasonal=False):
+    """
+    Orden ganador para la serie de unos filtros (cacheado por filtros, versión del dataset y opciones).
+    Devuelve (orden, orden estacional, ranking); si ningún candidato converge, el orden por defecto.
+    """
+    ranking = search_order(_values, criterion, seasonal)
+    if ranking.empty:
+        return ARIMA_ORDER, NO_SEASONAL_ORDER, ranking
+    best = ranking.iloc[0]
+    order = (int(best["p"]), int(best["d"]), int(best["q"]))
+    seasonal_order = (int(best["P"]), int(best["D"]), int(best["Q"]), int(best["s"]))
+    return order, seasonal_order, ranking
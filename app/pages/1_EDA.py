@@ -3,6 +3,12 @@ from PIL import Image
 import pandas as pd
 import base64
 import plotly.express as px
+from data_loader import DATASET_CSV, load_cube, load_dataset, load_profile, load_sample
+from approximate import APPROXIMATE_CAPTION, approximate_controls, refined_rollup
+from dataset_profile import categorical_summary, null_counts, numeric_summary
+from medal_cube import MEDAL_TYPES, rollup
+from perf import page_span, performance_panel, span
+from charts import show_chart
 
 def set_professional_header(image_path):
     """
@@ -38,26 +44,39 @@ def set_professional_header(image_path):
         unsafe_allow_html=True,
     )
 
+@page_span("page_eda")
 def page_eda():
     st.markdown("<h1 style='text-align: center;'>Exploración de Datos (EDA)</h1>", unsafe_allow_html=True)
     st.markdown("<h3 style='text-align: center;'>Vista del Dataset Final</h3>", unsafe_allow_html=True)
     st.markdown("<hr style='border: 1px solid #ABB2B9;'>", unsafe_allow_html=True)
     
-    dataset_path = r"C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\final_dataset_cleaned.csv"
-    
     try:
-        # Cargar el dataset
-        df = pd.read_csv(dataset_path)
+        # Cargar el dataset (compartido entre sesiones: no se modifica)
+        with span("load_dataset"):
+            df = load_dataset()
+        # Cubo de agregados para los gráficos
+        with span("load_cube"):
+            cube = load_cube()
+        # Perfil precalculado (estadísticos por columna, uno por versión del dataset)
+        with span("load_profile"):
+            profile = load_profile()
+        # Muestra estratificada, solo si el usuario activa el modo aproximado
+        sample = load_sample() if approximate_controls() else None
 
         # Mostrar un resumen inicial del dataset
         st.subheader("Vista previa del dataset:")
         st.dataframe(df.head(7))  # Mostrar las primeras filas
         
         st.markdown("**Dimensiones del Dataset**")
-        st.write(f"Filas: {df.shape[0]}, Columnas: {df.shape[1]}")
+        st.write(f"Filas: {profile['rows']}, Columnas: {len(profile['columns'])}")
         
         st.markdown("**Resumen estadístico del dataset**")
-        st.write(df.describe())
+        with span("profile_summary"):
+            st.write(numeric_summary(profile))
+            st.caption("Los percentiles se calculan con un resumen aproximado del dataset.")
+            with st.expander("Columnas categóricas y valores nulos"):
+                st.write(categorical_summary(profile))
+                st.write(null_counts(profile))
         
         # Crear pestañas para cada gráfico
         tabs = st.tabs(["Top 10 países con más medallas", "Relación entre PIB promedio y medallas", "Medallas por rango de PIB", "Relación entre deportes y clima"])
@@ -66,7 +85,8 @@ def page_eda():
         with tabs[0]:
             if "NOC" in df.columns and "Medal" in df.columns:
                 st.subheader("Top 10 países con más medallas")
-                medals_by_country = df.groupby("NOC")["Medal"].count().sort_values(ascending=False).head(10)
+                with span("top_countries.rollup"):
+                    medals_by_country = rollup(cube, ["NOC"]).set_index("NOC")["count"].sort_values(ascending=False).head(10)
                 medals_data = pd.DataFrame({
                     "País (NOC)": medals_by_country.index,
                     "Número de medallas": medals_by_country.values
@@ -86,26 +106,26 @@ def page_eda():
                     yaxis_title="Número de medallas",
                     title_x=0.5
                 )
-                st.plotly_chart(fig1)
+                show_chart(fig1, "top_countries")
 
         # Gráfico 2: Relación entre PIB promedio y medallas por grupo de ingresos
         with tabs[1]:
             if "Income Group" in df.columns and "GDP" in df.columns:
                 st.subheader("Relación entre PIB promedio y medallas por grupo de ingresos")
-                income_group_medals = df.groupby("Income Group").agg({
-                    "Medal": "count",
-                    "GDP": "mean"
-                }).reset_index()
-                pib_medallas = df.groupby('Income Group', as_index=False).agg({
-                    'GDP': 'mean',
-                    'Medal': 'count'
-                }).rename(columns={'Medal': 'Total de medallas', 'GDP': 'Promedio PIB'})    #PIB y medallas
+                # En modo aproximado, estimación con la muestra mientras se interactúa (ver approximate)
+                income_group_medals, approximate = refined_rollup(
+                    cube, sample, ["Income Group"], measures=["GDP"], name="income_gdp"
+                )
+                income_group_medals = income_group_medals.rename(columns={"count": "Medal", "count_error": "Medal Error"})
+                pib_medallas = income_group_medals.rename(columns={'Medal': 'Total de medallas', 'GDP': 'Promedio PIB'})    #PIB y medallas
+                pib_medallas['Total de medallas'] = pib_medallas['Total de medallas'].round()
 
                 fig = px.bar(
                     pib_medallas,
                     x='Income Group',
                     y='Total de medallas',
                     color='Income Group',
+                    error_y='Medal Error' if approximate else None,
                     title='Relación entre el PIB Promedio y las medallas totales por Income Group',
                     text='Total de medallas',
                     barmode='stack',
@@ -119,26 +139,19 @@ def page_eda():
                     legend_title_text='Grupo de Ingresos'
                 )
 
-                st.plotly_chart(fig)
+                show_chart(fig, "income_gdp.approx" if approximate else "income_gdp")
+                if approximate:
+                    st.caption(APPROXIMATE_CAPTION)
 
         # Gráfico 3: Medallas por rango de PIB
         with tabs[2]:
             if "GDP" in df.columns:
                 st.subheader("Número de medallas por rango de PIB")
-                df["GDP Range"] = pd.cut(df["GDP"], bins=5, labels=["Bajo", "Medio Bajo", "Medio", "Medio Alto", "Alto"])
-                gdp_medals = df.groupby("GDP Range")["Medal"].count().reset_index()
-                # Crear categorías para el PIB
-                df['PIB_Rango'] = pd.cut(
-                    df['GDP'], 
-                    bins=[0, 1e10, 5e10, 1e11, 5e11, 1e12, 1.5e12], 
-                    labels=['<10B', '10B-50B', '50B-100B', '100B-500B', '500B-1T', '>1T']
-                )
-
-                # Filtrar medallas
-                filtered_data = df[df['Medal'] != 'No Medal']
-
-                # Contar el número de medallas por rango de PIB
-                medals_by_pib_range = filtered_data.groupby('PIB_Rango')['Medal'].count().reset_index()
+                # Contar el número de medallas por rango de PIB (PIB_Rango es una variable del registro, ver features)
+                with span("gdp_range.rollup"):
+                    medals_by_pib_range = rollup(
+                        cube, ["PIB_Rango"], where={"Medal": MEDAL_TYPES}, observed=False
+                    ).rename(columns={"count": "Medal"})
 
                 # Crear gráfico de barras interactivo
                 fig3 = px.bar(
@@ -161,24 +174,18 @@ def page_eda():
                     template='plotly_white'
                 )
 
-                st.plotly_chart(fig3)
+                show_chart(fig3, "gdp_range")
 
         # Gráfico 4: Relación entre deportes y clima (anomalías de temperatura)
         with tabs[3]:
             if "Sport" in df.columns and "Annual Anomaly" in df.columns:
                 st.subheader("Relación entre deportes y clima")
-                climate_sport = df.groupby("Sport").agg({
-                    "Annual Anomaly": "mean",
-                    "Medal": "count"
-                }).reset_index().sort_values("Annual Anomaly", ascending=False).head(10)
-                outdoor_sports = ['Athletics', 'Cycling', 'Rowing', 'Sailing', 'Equestrianism', 'Beach Volleyball', 'Golf', 'Archery']
-                indoor_sports = ['Basketball', 'Gymnastics', 'Weightlifting', 'Fencing', 'Table Tennis', 'Ice Hockey', 'Wrestling']
-
-                df['Sport Category'] = df['Sport'].apply(
-                    lambda sport: 'Outdoor' if sport in outdoor_sports else ('Indoor' if sport in indoor_sports else 'Other')
-                )
-
-                sport_climate = df.groupby(['Sport Category', 'Year'])[['Annual Anomaly']].mean().reset_index()
+                climate_sport = rollup(
+                    cube, ["Sport"], measures=["Annual Anomaly"]
+                ).rename(columns={"count": "Medal"}).sort_values("Annual Anomaly", ascending=False).head(10)
+                # Sport Category viene del registro de variables (taxonomía en data/sport_categories.csv)
+                with span("sport_climate.rollup"):
+                    sport_climate = rollup(cube, ['Sport Category', 'Year'], measures=['Annual Anomaly'])[['Sport Category', 'Year', 'Annual Anomaly']]
 
                 fig4 = px.line(
                     sport_climate,
@@ -212,10 +219,10 @@ def page_eda():
                     )
                 )
 
-                st.plotly_chart(fig4)
+                show_chart(fig4, "sport_climate")
 
     except FileNotFoundError:
-        st.error(f"No se encontró el archivo {dataset_path}. Asegúrate de que está en el directorio correcto.")
+        st.error(f"No se encontró el archivo {DATASET_CSV}. Asegúrate de que está en el directorio correcto.")
     except Exception as e:
         st.error(f"Ocurrió un error inesperado: {e}")
 
@@ -226,4 +233,5 @@ if __name__ == "__main__":
     # Configurar el encabezado profesional
     set_professional_header(header_image_path)
     
-    page_eda()
\ No newline at end of file
+    page_eda()
+    performance_panel()
\ No newline at end of file
@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from plotly.subplots import make_subplots
 import base64
-import matplotlib.pyplot as plt
+from data_loader import DATASET_CSV, dataset_version, load_cube, load_sample
+from approximate import APPROXIMATE_CAPTION, approximate_controls, refined_rollup
+from medal_cube import MEDAL_TYPES, cube_fields, rollup
+from query_engine import query
+from perf import page_span, performance_panel, span
+from charts import MAX_POINTS, lean_scatter, show_chart
+from hypothesis import CONFIDENCE, N_RESAMPLES, slice_tests
 
 def set_professional_header(image_path):
     """
@@ -39,6 +44,53 @@ def set_professional_header(image_path):
         unsafe_allow_html=True,
     )
 
+def hypothesis_filters(cube):
+    """
+    Controles del subconjunto sobre el que se calculan los tests de hipótesis.
+    Devuelve el where de medal_cube.rollup y el número de remuestreos.
+    """
+    where = {}
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        seasons = sorted(cube["Season"].dropna().unique()) if "Season" in cube.columns else []
+        season = st.selectbox("Temporada", ["Todas"] + list(seasons), key="hypothesis_season")
+        if season != "Todas":
+            where["Season"] = season
+        n_resamples = st.select_slider(
+            "Remuestreos (bootstrap y permutación)",
+            options=[1000, N_RESAMPLES, 20000, 100000],
+            value=N_RESAMPLES,
+            key="hypothesis_resamples"
+        )
+    with col2:
+        years = cube["Year"].dropna()
+        year_range = st.slider(
+            "Años", int(years.min()), int(years.max()), (int(years.min()), int(years.max())), key="hypothesis_years"
+        )
+        where["Year"] = tuple(year_range)
+    for column, label, container in [("Region", "Regiones", col3), ("Income Group", "Grupos de ingresos", col3)]:
+        if column in cube.columns:
+            with container:
+                selected = st.multiselect(label, sorted(cube[column].dropna().unique()), key=f"hypothesis_{column}")
+            if selected:
+                where[column] = selected
+    return where, n_resamples
+
+
+def _result_line(label, row, decimals=4):
+    # Estimación con su intervalo bootstrap y sus p-valores (clásico y de permutación, si existen)
+    line = (
+        f"- **{label}:** {row['Estimate']:.{decimals}f} "
+        f"(IC {CONFIDENCE:.0%}: [{row['CI Low']:.{decimals}f}, {row['CI High']:.{decimals}f}]"
+    )
+    if pd.notna(row["p-value"]):
+        line += f"; p-value: {row['p-value']:.4f}"
+    if pd.notna(row["Permutation p-value"]):
+        line += f"; p-value de permutación: {row['Permutation p-value']:.4f}"
+    return line + ")"
+
+
+@page_span("page_cda")
 def page_cda():
     # Ruta de la imagen de encabezado
     header_image_path = "C:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FINAL_JJOO/app/pages/jjoo_background.png"
@@ -50,11 +102,13 @@ def page_cda():
     st.markdown("### Explorando patrones clave en los datos olímpicos.")
     st.markdown("<hr style='border: 1px solid #ABB2B9;'>", unsafe_allow_html=True)
 
-    # Ruta del dataset
-    dataset_path = "c:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FINAL_JJOO/app/pages/final_dataset_cleaned.csv"
     try:
-        # Cargar el dataset
-        df = pd.read_csv(dataset_path)
+        # Cargar el cubo de agregados (compartido entre sesiones: no se modifica)
+        with span("load_cube"):
+            cube = load_cube()
+        columns = cube_fields(cube)
+        # Muestra estratificada, solo si el usuario activa el modo aproximado
+        sample = load_sample() if approximate_controls() else None
 
         # Crear pestañas
         tabs = st.tabs([
@@ -67,11 +121,13 @@ def page_cda():
         # Pestaña 1: Relación PIB-Medallas
         with tabs[0]:
             st.subheader("Relación entre PIB promedio y medallas ganadas")
-            if "GDP" in df.columns and "Medal" in df.columns:
-                df_medals = df[df["Medal"] != "No Medal"]
-                df_pib_medals = df_medals.groupby("NOC").agg({"GDP": "mean", "Medal": "count"}).reset_index()
+            if "GDP" in columns and "Medal" in columns:
+                with span("gdp_medals.query"):
+                    df_pib_medals = query(
+                        ["NOC"], where={"Medal": MEDAL_TYPES}, measures=["GDP"]
+                    ).rename(columns={"count": "Medal"})
 
-                fig = px.scatter(
+                fig, n_points = lean_scatter(
                     df_pib_medals,
                     x="GDP",
                     y="Medal",
@@ -89,24 +145,31 @@ def page_cda():
                     xaxis=dict(title="PIB Promedio (USD)", tickangle=45, gridcolor="LightGrey"),
                     yaxis=dict(title="Número de Medallas", gridcolor="LightGrey")
                 )
-                st.plotly_chart(fig)
+                show_chart(fig, "gdp_medals")
+                if n_points > MAX_POINTS:
+                    st.caption(f"Se muestra una muestra de {MAX_POINTS:,} de {n_points:,} países.")
             else:
                 st.warning("El dataset no contiene las columnas necesarias ('GDP' y 'Medal').")
 
         # Pestaña 2: Crecimiento deportivo
         with tabs[1]:
             st.subheader("Crecimiento de participación en deportes en las últimas décadas")
-            if "Sport" in df.columns and "Year" in df.columns:
-                recent_decades = df[df["Year"] >= 1980]
-                top_sports = recent_decades["Sport"].value_counts().nlargest(10).index
-                recent_decades_top_sports = recent_decades[recent_decades["Sport"].isin(top_sports)]
-                sport_medals = recent_decades_top_sports.groupby(["Year", "Sport"])["Medal"].count().reset_index()
-                
+            if "Sport" in columns and "Year" in columns:
+                recent_decades = {"Year": (1980, None)}
+                with span("sport_growth.top_sports"):
+                    top_sports = rollup(cube, ["Sport"], where=recent_decades).nlargest(10, "count")["Sport"]
+
+                # En modo aproximado, estimación con la muestra mientras se interactúa (ver approximate)
+                sport_medals, approximate = refined_rollup(
+                    cube, sample, ["Year", "Sport"], where={**recent_decades, "Sport": list(top_sports)}, name="sport_growth"
+                )
+                sport_medals = sport_medals.rename(columns={"count": "Medal", "count_error": "Medal Error"})
                 fig = px.line(
                     sport_medals,
                     x="Year",
                     y="Medal",
                     color="Sport",
+                    error_y="Medal Error" if approximate else None,
                     title="Crecimiento de participación en los 10 deportes más practicados desde 1980",
                     labels={"Year": "Año", "Medal": "Número de Medallas", "Sport": "Deporte"},
                     markers=True,
@@ -119,20 +182,26 @@ def page_cda():
                     yaxis=dict(title="Número de Medallas", gridcolor="LightGrey"),
                     legend_title="Deporte"
                 )
-                st.plotly_chart(fig)
+                show_chart(fig, "sport_growth.approx" if approximate else "sport_growth")
+                if approximate:
+                    st.caption(APPROXIMATE_CAPTION)
             else:
                 st.warning("El dataset no contiene las columnas necesarias ('Sport' y 'Year').")
 
         # Pestaña 3: Países desarrollados vs en desarrollo
         with tabs[2]:
             st.subheader("Participación y medallas: Países desarrollados vs en desarrollo")
-            if "Income Group" in df.columns and "Year" in df.columns and "Medal" in df.columns:
-                income_medals = df[df["Medal"] != "No Medal"].groupby(["Year", "Income Group"])["Medal"].count().reset_index()
+            if "Income Group" in columns and "Year" in columns and "Medal" in columns:
+                income_medals, approximate = refined_rollup(
+                    cube, sample, ["Year", "Income Group"], where={"Medal": MEDAL_TYPES}, name="income_trend"
+                )
+                income_medals = income_medals.rename(columns={"count": "Medal", "count_error": "Medal Error"})
                 fig = px.line(
                     income_medals,
                     x="Year",
                     y="Medal",
                     color="Income Group",
+                    error_y="Medal Error" if approximate else None,
                     title="Tendencias de Medallas: Países por Grupos de Ingresos",
                     labels={"Year": "Año", "Medal": "Número de Medallas", "Income Group": "Grupo de Ingresos"},
                     markers=True,
@@ -145,12 +214,20 @@ def page_cda():
                     yaxis=dict(title="Número de Medallas", gridcolor="LightGrey"),
                     legend_title="Grupo de Ingresos"
                 )
-                st.plotly_chart(fig)
+                show_chart(fig, "income_trend.approx" if approximate else "income_trend")
+                if approximate:
+                    st.caption(APPROXIMATE_CAPTION)
             else:
                 st.warning("El dataset no contiene las columnas necesarias ('Income Group', 'Year', y 'Medal').")
 
         with tabs[3]:
             st.subheader("Test de Hipótesis")
+            # Los tests se recalculan sobre el subconjunto elegido (cacheados por subconjunto y versión del dataset)
+            where, n_resamples = hypothesis_filters(cube)
+            with span("hypothesis.tests"):
+                results = slice_tests(cube, dataset_version(), where, n_resamples)
+            gdp_tests, gdp_countries = results["gdp"]
+            population_tests, population_countries = results["population"]
             st.markdown("### 1️⃣ ¿La economía de un país está relacionada con su participación olímpica?")
             
             # Subsection: PIB y participaciones
@@ -160,21 +237,30 @@ def page_cda():
                 st.markdown("#### Hipótesis:")
                 st.markdown("Los países con un PIB promedio más alto tienen una mayor participación en los Juegos Olímpicos.")
                 st.markdown("### Resultado: ")
-                st.markdown("- **Correlación de Pearson:** 0.79 (p-value: 0.0000)")
-                st.markdown("- **Correlación de Spearman:** 0.85 (p-value: 0.0000)")
-                st.markdown("### Conclusión:")
-                st.write("""
-                Con base en los resultados del análisis, **sí existe una relación significativa entre el PIB promedio de un país y su participación en los Juegos Olímpicos**. 
-                Los países con un PIB más alto tienden a participar con mayor frecuencia en las competencias.
-                """)
+                if gdp_tests is None:
+                    st.warning(f"No hay suficientes países en el subconjunto ({gdp_countries}).")
+                else:
+                    gdp_rows = gdp_tests.set_index("Statistic")
+                    st.markdown(_result_line("Correlación de Pearson", gdp_rows.loc["pearson"], 2))
+                    st.markdown(_result_line("Correlación de Spearman", gdp_rows.loc["spearman"], 2))
+                    st.caption(f"{gdp_countries} países · {n_resamples:,} remuestreos")
+                    st.markdown("### Conclusión:")
+                    if gdp_rows.loc["pearson", "p-value"] < 0.05 and gdp_rows.loc["pearson", "Estimate"] > 0:
+                        st.write("""
+                        Con base en los resultados del análisis, **sí existe una relación significativa entre el PIB promedio de un país y su participación en los Juegos Olímpicos**. 
+                        Los países con un PIB más alto tienden a participar con mayor frecuencia en las competencias.
+                        """)
+                    else:
+                        st.write("""
+                        En este subconjunto **no se encuentra una relación positiva significativa entre el PIB promedio de un país y su participación en los Juegos Olímpicos**.
+                        """)
             
             with col2:
                 # Gráfico interactivo para PIB vs Participaciones
-                if "Income Group" in df.columns and "GDP" in df.columns:
-                    income_pib_participation = df.groupby("Income Group").agg({
-                        "GDP": "mean",
-                        "Year": "count"
-                    }).reset_index().rename(columns={"Year": "Participaciones", "GDP": "PIB Promedio"})
+                if "Income Group" in columns and "GDP" in columns:
+                    income_pib_participation = query(
+                        ["Income Group"], where=where, measures=["GDP"]
+                    ).rename(columns={"count": "Participaciones", "GDP": "PIB Promedio"})
                     
                     fig1 = px.scatter(
                         income_pib_participation,
@@ -188,7 +274,7 @@ def page_cda():
                         template="plotly_white"
                     )
                     fig1.update_layout(title_x=0.5)
-                    st.plotly_chart(fig1)
+                    show_chart(fig1, "hypothesis_gdp")
                     
 
             st.markdown("---")
@@ -202,26 +288,38 @@ def page_cda():
                 st.markdown("#### Hipótesis:")
                 st.markdown("Los países con mayor población envían más atletas a los Juegos Olímpicos.")
                 st.markdown("### Resultado:")
-                st.markdown("- **Pendiente (slope):** 0.0000")
-                st.markdown("- **Intercepto:** 1009.4244")
-                st.markdown("- **R-cuadrado:** 0.0526")
-                st.markdown("- **p-value:** 0.0118")
-                st.markdown("### Conclusión:")
-                st.write("""
+                if population_tests is None:
+                    st.warning(f"No hay suficientes países en el subconjunto ({population_countries}).")
+                else:
+                    population_rows = population_tests.set_index("Statistic")
+                    # La pendiente se expresa en atletas por millón de habitantes (en atletas por habitante sería ~0)
+                    slope = population_rows.loc["slope"].copy()
+                    slope[["Estimate", "CI Low", "CI High"]] *= 1e6
+                    st.markdown(_result_line("Pendiente (atletas por millón de habitantes)", slope))
+                    st.markdown(_result_line("Intercepto", population_rows.loc["intercept"]))
+                    st.markdown(_result_line("R-cuadrado", population_rows.loc["r_squared"]))
+                    st.caption(f"{population_countries} países · {n_resamples:,} remuestreos")
+                    st.markdown("### Conclusión:")
+                    if population_rows.loc["slope", "p-value"] < 0.05 and slope["Estimate"] > 0:
+                        st.write("""
                         Los resultados sugieren que **la población tiene un impacto moderado en el número de atletas enviados por un país**.
                         Aunque existe una relación positiva, otros factores como la inversión en deportes y la infraestructura también juegan un rol importante.
                         """)
+                    else:
+                        st.write("""
+                        En este subconjunto **no se encuentra una relación positiva significativa entre la población y el número de atletas enviados**.
+                        """)
                 
             
             with col2:
                 # Gráfico interactivo para Población vs Atletas
-                if "Population" in df.columns and "NOC" in df.columns:
-                    population_athletes = df.groupby("NOC").agg({
-                        "Population": "mean",
-                        "Year": "count"
-                    }).reset_index().rename(columns={"Year": "Atletas Enviados", "Population": "Población Promedio"})
+                if "Population" in columns and "NOC" in columns:
+                    population_athletes = query(
+                        ["NOC"], where=where, measures=["Population"]
+                    ).rename(columns={"count": "Atletas Enviados", "Population": "Población Promedio"})
 
-                    fig2 = px.scatter(
+                    # Un único trace coloreado por NOC (en lugar de un trace por país)
+                    fig2, n_points = lean_scatter(
                         population_athletes,
                         x="Población Promedio",
                         y="Atletas Enviados",
@@ -233,13 +331,14 @@ def page_cda():
                         template="plotly_white"
                     )
                     fig2.update_layout(title_x=0.5)
-                    
-                    
-                    st.plotly_chart(fig2)
+                    show_chart(fig2, "hypothesis_population")
+                    if n_points > MAX_POINTS:
+                        st.caption(f"Se muestra una muestra de {MAX_POINTS:,} de {n_points:,} países.")
     except FileNotFoundError:
-        st.error(f"No se encontró el archivo {dataset_path}. Asegúrate de que está en el directorio correcto.")
+        st.error(f"No se encontró el archivo {DATASET_CSV}. Asegúrate de que está en el directorio correcto.")
     except Exception as e:
         st.error(f"Ocurrió un error inesperado: {e}")
 
 if __name__ == "__main__":
-    page_cda()
\ No newline at end of file
+    page_cda()
+    performance_panel()
\ No newline at end of file
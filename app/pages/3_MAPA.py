@@ -1,7 +1,12 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import base64
+from country_codes import load_country_codes, map_country_codes
+from data_loader import dataset_version, load_cube
+from map_frames import animated_medal_map
+from query_engine import query
+from perf import page_span, performance_panel, span
+from charts import show_chart
 
 def set_professional_header(image_path):
     """
@@ -39,6 +44,7 @@ def set_professional_header(image_path):
 # Ruta de la imagen de encabezado
 header_image_path = "C:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FINAL_JJOO/app/pages/jjoo_background.png"
 
+@page_span("page_predictive_analysis")
 def page_predictive_analysis():
     set_professional_header(header_image_path)
     
@@ -49,66 +55,87 @@ def page_predictive_analysis():
         "con la posibilidad de filtrar por año, temporada y tipo de medalla."
     )
     
-    # Cargar dataset
-    dataset_path = r"C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\final_dataset_cleaned.csv"
-    df = pd.read_csv(dataset_path)
+    # Cargar el cubo de agregados
+    with span("load_cube"):
+        cube = load_cube()
     
     # Filtrar dataset
     st.sidebar.header("Filtros para el Mapa")
-    years = sorted(df["Year"].unique())
-    selected_year = st.sidebar.selectbox("Selecciona un Año", years, index=len(years) - 1)
+    # Mapa animado: todas las ediciones en una sola figura; el año se cambia en el navegador sin recargar la página
+    animated = st.sidebar.checkbox("Animar todas las ediciones", value=True)
+    years = sorted(cube["Year"].unique())
     
-    seasons = df["Season"].unique()
+    seasons = cube["Season"].unique()
     selected_season = st.sidebar.radio("Selecciona una Temporada", seasons)
     
     medals = ["Gold", "Silver", "Bronze"]
     selected_medal = st.sidebar.multiselect("Selecciona el Tipo de Medalla", medals, default=medals)
     
-    # Filtrar dataset según los filtros seleccionados
-    filtered_df = df[
-        (df["Year"] == selected_year) &
-        (df["Season"] == selected_season) &
-        (df["Medal"].isin(selected_medal))
-    ]
-    
-    # Crear datos agregados por país
-    country_medals = filtered_df.groupby("NOC", as_index=False).agg({"Medal": "count"})
-    country_medals.rename(columns={"Medal": "Número de Medallas"}, inplace=True)
-    
-    # Asegurarnos de tener un archivo con los códigos ISO de cada país
-    country_codes = pd.read_csv("https://raw.githubusercontent.com/plotly/datasets/master/2014_world_gdp_with_codes.csv")
-    country_medals = pd.merge(country_medals, country_codes, left_on="NOC", right_on="CODE", how="inner")
+    fig = None
+    if animated:
+        with span("map.animated"):
+            fig, unmapped_nocs, budget = animated_medal_map(cube, dataset_version(), selected_season, tuple(selected_medal))
+        editions = f"todas las ediciones ({selected_season})"
+        if not budget["within_budget"]:
+            st.warning(
+                f"El mapa animado supera el presupuesto ({budget['payload_bytes'] / 1e6:.1f} MB de figura, "
+                f"{budget['memory_bytes'] / 1e6:.1f} MB de datos): se muestra una sola edición."
+            )
+            fig = None
+
+    if fig is None:
+        selected_year = st.sidebar.selectbox("Selecciona un Año", years, index=len(years) - 1)
+        editions = f"{selected_year} ({selected_season})"
+
+        # Crear datos agregados por país según los filtros seleccionados
+        # Consulta al Parquet del cubo: solo se leen los row groups de la edición elegida
+        with span("query"):
+            country_medals = query(
+                ["NOC"],
+                where={"Year": selected_year, "Season": selected_season, "Medal": selected_medal}
+            )
+            country_medals.rename(columns={"count": "Número de Medallas"}, inplace=True)
+        
+        # Asociar cada NOC a su código ISO del país con la tabla local de códigos
+        with span("country_codes"):
+            country_codes = load_country_codes()
+            country_medals, unmapped_nocs = map_country_codes(country_medals, country_codes, "Número de Medallas")
+        
+        with span("map.figure"):
+            fig = px.choropleth(
+                country_medals,
+                locations="ISO3",
+                color="Número de Medallas",
+                hover_name="Country",
+                hover_data=["Número de Medallas", "NOC"],
+                title=f"Medallas por País en {selected_year} - {selected_season}",
+                color_continuous_scale="Viridis",
+                projection="natural earth"
+            )
+        
+        fig.update_layout(
+            geo=dict(
+                showframe=False,
+                showcoastlines=True,
+                coastlinecolor="LightGray",
+                projection_type="natural earth"
+            ),
+            width=1000,  # Ajustar el ancho del mapa
+            height=700   # Ajustar la altura del mapa
+        )
     
     # Crear mapa interactivo
     st.markdown("#### Mapa de Medallas Olímpicas por País")
-    fig = px.choropleth(
-        country_medals,
-        locations="CODE",
-        color="Número de Medallas",
-        hover_name="COUNTRY",
-        hover_data=["Número de Medallas"],
-        title=f"Medallas por País en {selected_year} - {selected_season}",
-        color_continuous_scale="Viridis",
-        projection="natural earth"
-    )
-    
-    fig.update_layout(
-        geo=dict(
-            showframe=False,
-            showcoastlines=True,
-            coastlinecolor="LightGray",
-            projection_type="natural earth"
-        ),
-        width=1000,  # Ajustar el ancho del mapa
-        height=700   # Ajustar la altura del mapa
-    )
-    
-    st.plotly_chart(fig)
+    show_chart(fig, "map")
+
+    if unmapped_nocs:
+        st.caption(f"NOC sin código ISO de país (no se muestran en el mapa): {', '.join(unmapped_nocs)}")
 
     # Información adicional debajo del mapa
     st.markdown(
-        f"En el mapa se muestran los países que participaron en los Juegos Olímpicos de {selected_year} ({selected_season}). "
+        f"En el mapa se muestran los países que participaron en los Juegos Olímpicos de {editions}. "
         f"El tamaño y color indican el número de medallas ganadas."
     )
 
-page_predictive_analysis()
\ No newline at end of file
+page_predictive_analysis()
+performance_panel()
\ No newline at end of file
@@ -1,9 +1,12 @@
 import streamlit as st
-import pickle
 import pandas as pd
 import plotly.express as px
-from sklearn.preprocessing import StandardScaler
 import base64
+from model_registry import DEFAULT_FEATURES, load_participation_model, participation_model_key, predict_participation
+from batch_prediction import PREDICTION_COLUMN, REQUIRED_FEATURES, file_format, predict_file
+from sensitivity import SWEEP_FEATURES, sensitivity_sweep
+from perf import page_span, performance_panel, span
+from charts import show_chart
 
 def set_professional_header(image_path):
     """
@@ -41,6 +44,7 @@ def set_professional_header(image_path):
 # Ruta de la imagen de encabezado
 header_image_path = "C:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FINAL_JJOO/app/pages/jjoo_background.png"
 
+@page_span("page_analisis_predictivo")
 def page_analisis_predictivo():
     # Configurar el encabezado profesional
     set_professional_header(header_image_path)
@@ -64,6 +68,14 @@ def page_analisis_predictivo():
         width=600
     )
 
+    # Cargar el modelo y el escalador (una sola vez por proceso, compartidos entre sesiones)
+    try:
+        with span("load_model"):
+            participation_model = load_participation_model()
+    except Exception as e:
+        participation_model = None
+        st.error(f"No se pudo cargar el modelo predictivo: {e}")
+
     # Simulación interactiva
     st.subheader("Simulación interactiva: Ajusta los parámetros")
     
@@ -79,28 +91,20 @@ def page_analisis_predictivo():
     anomaly_input = st.slider("Anomalías climáticas (°C)", -1.0, 2.0, step=0.1)
 
     # Botón para realizar la predicción
-    if st.button("Realizar Predicción"):
+    if st.button("Realizar Predicción") and participation_model is not None:
         try:
-            # Cargar el modelo y el escalador desde los archivos
-            with open(r"C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\nuevo_scaler.pkl", "rb") as f:
-                scaler = pickle.load(f)
-            with open(r"C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\xgboost_model.pkl", "rb") as f:
-                model = pickle.load(f)
-
             # Crear un DataFrame con las características necesarias para el escalador
             input_data = pd.DataFrame({
                 "GDP": [pib_scaled],
                 "Population": [poblacion_scaled],
                 "Annual Anomaly": [anomaly_input],
-                "Monthly Anomaly": [0.1],  # Valor por defecto
-                "Participation_Per_Million": [0.5]  # Valor por defecto
+                "Monthly Anomaly": [DEFAULT_FEATURES["Monthly Anomaly"]],  # Valor por defecto
+                "Participation_Per_Million": [DEFAULT_FEATURES["Participation_Per_Million"]]  # Valor por defecto
             })
 
-            # Escalar los datos
-            scaled_data = scaler.transform(input_data)
-
-            # Realizar la predicción
-            prediction = model.predict(scaled_data)[0]
+            # Escalar los datos y realizar la predicción
+            with span("predict"):
+                prediction = predict_participation(participation_model, input_data)[0]
 
             # Mostrar la predicción
             st.success(f"Basado en los parámetros proporcionados, el modelo predice una participación estimada de {prediction / 1_000_000:,.2f} millones de personas.")
@@ -118,6 +122,82 @@ def page_analisis_predictivo():
         except Exception as e:
             st.error(f"No se pudo realizar la predicción: {e}")
 
+    # Análisis de sensibilidad: barrido de una o dos variables sobre el escenario base
+    st.subheader("Análisis de sensibilidad")
+    st.markdown("Elige una variable para ver su curva de sensibilidad o dos para ver el mapa de calor de la participación predicha.")
+    sweep_features = st.multiselect(
+        "Variables a analizar",
+        list(SWEEP_FEATURES),
+        default=["GDP"],
+        max_selections=2,
+        format_func=lambda feature: SWEEP_FEATURES[feature]["label"]
+    )
+    steps = st.select_slider("Puntos por variable", options=[25, 50, 100, 200], value=100)
+    axes_spec = []
+    for feature in sweep_features:
+        config = SWEEP_FEATURES[feature]
+        low, high = st.slider(f"Rango de {config['label']}", *config["limits"], config["default"])
+        axes_spec.append((feature, low * config["scale"], high * config["scale"], steps))
+
+    if axes_spec and participation_model is not None:
+        try:
+            with span("sensitivity.sweep"):
+                axis_values, predictions = sensitivity_sweep(participation_model, participation_model_key(), tuple(axes_spec))
+            labels = [SWEEP_FEATURES[feature]["label"] for feature in sweep_features]
+            scales = [SWEEP_FEATURES[feature]["scale"] for feature in sweep_features]
+            if len(axes_spec) == 1:
+                fig_sensitivity = px.line(
+                    x=axis_values[0] / scales[0],
+                    y=predictions,
+                    labels={"x": labels[0], "y": "Participación predicha"},
+                    title=f"Impacto de {labels[0]} en la participación predicha",
+                    template="plotly_white"
+                )
+            else:
+                fig_sensitivity = px.imshow(
+                    predictions.T,
+                    x=axis_values[0] / scales[0],
+                    y=axis_values[1] / scales[1],
+                    labels={"x": labels[0], "y": labels[1], "color": "Participación predicha"},
+                    title="Participación predicha según ambas variables",
+                    color_continuous_scale="Viridis",
+                    origin="lower",
+                    aspect="auto"
+                )
+            fig_sensitivity.update_layout(title_x=0.5)
+            show_chart(fig_sensitivity, "sensitivity")
+        except Exception as e:
+            st.error(f"No se pudo calcular el análisis de sensibilidad: {e}")
+
+    # Predicción por lotes a partir de un archivo de escenarios
+    st.subheader("Predicción por lotes: sube tus escenarios")
+    st.markdown(
+        f"Sube un archivo CSV o Parquet con una fila por escenario y las columnas {', '.join(REQUIRED_FEATURES)} "
+        f"(opcionalmente Monthly Anomaly y Participation_Per_Million; si faltan se usan "
+        f"{DEFAULT_FEATURES['Monthly Anomaly']} y {DEFAULT_FEATURES['Participation_Per_Million']})."
+    )
+    scenarios_file = st.file_uploader("Archivo de escenarios", type=["csv", "parquet"])
+    if scenarios_file is not None and participation_model is not None:
+        try:
+            # Lectura, predicción y escritura cacheadas por archivo y versión del modelo
+            with span("batch.predict"):
+                n_scenarios, result_bytes, preview = predict_file(
+                    participation_model, participation_model_key(), scenarios_file.getvalue(), scenarios_file.name
+                )
+            output_format = file_format(scenarios_file.name)
+
+            st.success(f"Se han calculado {n_scenarios:,} predicciones.")
+            st.download_button(
+                label="Descargar predicciones",
+                data=result_bytes,
+                file_name=f"predicciones_participacion.{output_format}",
+                mime="application/octet-stream" if output_format == "parquet" else "text/csv"
+            )
+            st.markdown(f"Vista previa (columna **{PREDICTION_COLUMN}**):")
+            st.dataframe(preview)
+        except Exception as e:
+            st.error(f"No se pudo realizar la predicción por lotes: {e}")
+
     # Explicación técnica del modelo
     st.markdown("""
     #### Descripción técnica del modelo
@@ -129,3 +209,4 @@ def page_analisis_predictivo():
 # Para probar la página directamente
 if __name__ == "__main__":
     page_analisis_predictivo()
+    performance_panel()
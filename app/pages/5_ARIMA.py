@@ -1,8 +1,15 @@
 import streamlit as st
 import pandas as pd
-from statsmodels.tsa.arima.model import ARIMA
 import base64
 import plotly.express as px
+from data_loader import dataset_version, load_cube
+from forecasting import ARIMA_ORDER, NO_SEASONAL_ORDER, artifact_forecast, filter_signature, forecast_years, get_arima_fit
+from order_search import select_order
+from forecast_store import load_forecast_store
+from medal_cube import MEDAL_TYPES, rollup
+from query_engine import query
+from perf import page_span, performance_panel, span
+from charts import show_chart
 
 def set_professional_header(image_path):
     """
@@ -37,6 +44,7 @@ def set_professional_header(image_path):
         unsafe_allow_html=True,
     )
 
+@page_span("page_arima_predictivo")
 def page_arima_predictivo():
     # Ruta de la imagen de encabezado
     header_image_path = "C:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FINAL_JJOO/app/pages/jjoo_background.png"
@@ -51,24 +59,31 @@ def page_arima_predictivo():
     """)
     st.markdown("<hr style='border: 1px solid #ABB2B9;'>", unsafe_allow_html=True)
 
-    # Cargar el dataset
-    df = pd.read_csv(r'C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\final_dataset_cleaned.csv')  # Asegúrate de que este archivo esté en la ruta correcta
+    # Cargar el cubo de agregados
+    with span("load_cube"):
+        cube = load_cube()
 
     # Filtros interactivos
     st.sidebar.subheader("Filtros")
-    years = st.sidebar.slider("Rango de años", int(df['Year'].min()), int(df['Year'].max()), (1980, 2020))
+    years_range = (int(cube['Year'].min()), int(cube['Year'].max()))
+    years = st.sidebar.slider("Rango de años", *years_range, years_range)
     medal_type = st.sidebar.selectbox("Tipo de medallas", ["Todas", "Gold", "Silver", "Bronze"])
-    region = st.sidebar.multiselect("Región", options=df['Region'].dropna().unique(), default=None)
+    region = st.sidebar.multiselect("Región", options=cube['Region'].dropna().unique(), default=None)
+    auto_order = st.sidebar.checkbox("Seleccionar el orden ARIMA automáticamente")
+    if auto_order:
+        criterion = st.sidebar.radio("Criterio de selección", ["aic", "bic"], format_func=str.upper, horizontal=True)
+        seasonal = st.sidebar.checkbox("Incluir el ciclo olímpico (estacionalidad)")
 
     # Aplicar filtros
-    df_filtered = df[(df['Year'] >= years[0]) & (df['Year'] <= years[1])]
-    if medal_type != "Todas":
-        df_filtered = df_filtered[df_filtered['Medal'] == medal_type]
+    filters = {'Year': (years[0], years[1])}
+    # "Todas" son las tres medallas (como en el entrenamiento del modelo guardado), sin los "No Medal"
+    filters['Medal'] = medal_type if medal_type != "Todas" else MEDAL_TYPES
     if region:
-        df_filtered = df_filtered[df_filtered['Region'].isin(region)]
+        filters['Region'] = region
 
     # Agrupar datos por año
-    df_series_medals = df_filtered.groupby('Year').size().reset_index(name='Total Medals')
+    with span("query"):
+        df_series_medals = query(['Year'], where=filters).rename(columns={'count': 'Total Medals'})
 
     if df_series_medals.empty:
         st.warning("No hay datos disponibles para los filtros seleccionados. Intenta ajustar los filtros.")
@@ -84,23 +99,39 @@ def page_arima_predictivo():
         labels={'Year': 'Año', 'Total Medals': 'Número total de medallas'},
         markers=True
     )
-    st.plotly_chart(fig)
+    show_chart(fig, "history")
 
     # Ajustar el modelo ARIMA
     st.markdown("### Predicciones futuras de medallas")
     try:
-        model = ARIMA(df_series_medals['Total Medals'], order=(1, 1, 1))
-        model_fit = model.fit()
+        # Con los filtros por defecto se sirve el modelo guardado (arima_model.pkl); con otros filtros
+        # el ajuste se cachea, así que cambiar solo el horizonte no vuelve a ajustar el modelo
+        signature = filter_signature(years, medal_type, region)
+        default_signature = filter_signature(years_range, "Todas", [])
+        order, seasonal_order = ARIMA_ORDER, NO_SEASONAL_ORDER
+        if auto_order:
+            with span("order_search"):
+                order, seasonal_order, ranking = select_order(
+                    signature, dataset_version(), df_series_medals['Total Medals'].to_numpy(dtype=float), criterion, seasonal
+                )
+            st.caption(f"Orden seleccionado: ARIMA{order}" + (f" × {seasonal_order}" if seasonal_order != NO_SEASONAL_ORDER else ""))
+            with st.expander("Candidatos evaluados"):
+                st.dataframe(ranking.head(10))
+        with span("arima_fit"):
+            model_fit, from_artifact = get_arima_fit(
+                signature, dataset_version(), df_series_medals['Total Medals'], default_signature, order, seasonal_order
+            )
+        if from_artifact:
+            st.caption("Predicciones del modelo ARIMA entrenado (arima_model.pkl).")
         
         # Realizar predicción
         steps = st.slider("Número de años a predecir", 1, 10, 5)
-        forecast = model_fit.forecast(steps=steps)
+        with span("forecast"):
+            forecast = model_fit.forecast(steps=steps)
         
         # Crear DataFrame para las predicciones
-        last_year = df_series_medals['Year'].max()
-        forecast_years = [last_year + i for i in range(1, steps + 1)]
         forecast_df = pd.DataFrame({
-            "Año": forecast_years,
+            "Año": forecast_years(df_series_medals['Year'], steps),
             "Predicción de Medallas": forecast
         })
 
@@ -117,18 +148,52 @@ def page_arima_predictivo():
             labels={'Año': 'Año', 'Predicción de Medallas': 'Número total de medallas'},
             markers=True
         )
-        st.plotly_chart(fig_forecast)
+        show_chart(fig_forecast, "forecast")
     except Exception as e:
         st.error(f"No se pudo ajustar el modelo ARIMA: {e}")
 
-    # Añadir tabla estática de predicciones
-    static_forecast_df = pd.DataFrame({
-        "Año": [2028, 2032, 2036, 2040, 2044],
-        "Predicción de Medallas": [600, 1900, 640, 1861, 679]  # Valores generados previamente
-    })
-    st.markdown("### Predicciones estáticas de medallas")
-    st.table(static_forecast_df)
+    # Añadir tabla estática de predicciones, calculada con el modelo guardado sobre la serie completa
+    try:
+        medal_years = rollup(cube, ['Year'], where={'Medal': MEDAL_TYPES})['Year']
+        with span("static_forecast"):
+            static_forecast_df = artifact_forecast(medal_years)
+        st.markdown("### Predicciones estáticas de medallas")
+        st.table(static_forecast_df)
+    except Exception as e:
+        st.error(f"No se pudo cargar el modelo ARIMA guardado: {e}")
+
+    # Predicciones precalculadas por país y por región (python app/forecast_store.py)
+    st.markdown("### Predicciones por país o región")
+    with span("load_forecast_store"):
+        store = load_forecast_store()
+    if store is None:
+        st.info("Todavía no se han precalculado las predicciones por país y región (python app/forecast_store.py).")
+        return
+    forecasts, diagnostics = store
+    level_labels = {"País (NOC)": "NOC", "Región": "Region"}
+    level = level_labels[st.radio("Nivel", list(level_labels), horizontal=True)]
+    keys = sorted(diagnostics.loc[diagnostics['Level'] == level, 'Key'])
+    key = st.selectbox("País o región", keys)
+    key_forecast = forecasts[(forecasts['Level'] == level) & (forecasts['Key'] == key)]
+    key_diagnostics = diagnostics[(diagnostics['Level'] == level) & (diagnostics['Key'] == key)].iloc[0]
+    if key_forecast.empty:
+        st.warning(f"No hay predicción para {key}: serie demasiado corta o ajuste fallido ({key_diagnostics['Status']}).")
+        return
+
+    fig_store = px.line(
+        key_forecast,
+        x='Year',
+        y='Forecast',
+        error_y=key_forecast['Upper'] - key_forecast['Forecast'],
+        error_y_minus=key_forecast['Forecast'] - key_forecast['Lower'],
+        title=f"Predicción de medallas para {key}",
+        labels={'Year': 'Año', 'Forecast': 'Número de medallas'},
+        markers=True
+    )
+    show_chart(fig_store, "store")
+    st.caption(f"Observaciones: {key_diagnostics['Observations']} · AIC: {key_diagnostics['AIC']:.1f} · BIC: {key_diagnostics['BIC']:.1f}")
 
 # Probar la página directamente
 if __name__ == "__main__":
-    page_arima_predictivo()
\ No newline at end of file
+    page_arima_predictivo()
+    performance_panel()
\ No newline at end of file
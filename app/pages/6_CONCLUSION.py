@@ -1,9 +1,8 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import os
-from fpdf import FPDF
 import base64
+from data_loader import dataset_version, load_cube
+from perf import page_span, performance_panel, span
+from report import REPORT_FILE_NAME, chart_images, report_content, submit_report
 
 # Configuración de la página
 st.set_page_config(
@@ -52,112 +51,92 @@ header_image_path = "C:/Users/luna/OneDrive/Escritorio/BOOTCAMP_DATA/PROYECTO_FI
 set_professional_header(header_image_path)
 
 # Función para cargar datos
-@st.cache_data
 def load_data():
-    # Cargar el dataset principal
-    data = pd.read_csv(r"C:\Users\luna\OneDrive\Escritorio\BOOTCAMP_DATA\PROYECTO_FINAL_JJOO\app\pages\final_dataset_cleaned.csv")
+    # Cargar el cubo de agregados del dataset principal (cacheado una vez por proceso en data_loader)
+    data = load_cube()
     return data
 
-# Función para crear gráficos
+# Funciones para mostrar los gráficos: los PNG se generan una vez por versión del dataset (report.chart_images)
+# y se sirven desde la caché, sin crear figuras de matplotlib en cada ejecución de la página
 def plot_top_countries(data):
     st.subheader("🎖️ Top 10 Países con Más Medallas")
-    country_medals = data.groupby('NOC')['Medal'].count().sort_values(ascending=False).head(10)
-    fig, ax = plt.subplots()
-    country_medals.plot(kind='bar', ax=ax, color='gold')
-    ax.set_title("Top 10 Países con Más Medallas")
-    ax.set_ylabel("Número de Medallas")
-    st.pyplot(fig)
+    st.image(chart_images(data, dataset_version())[0])
 
 def plot_medals_over_time(data):
     st.subheader("📊 Evolución del Número de Medallas a lo Largo del Tiempo")
-    medals_by_year = data.groupby('Year')['Medal'].count()
-    fig, ax = plt.subplots()
-    medals_by_year.plot(ax=ax, color='skyblue', marker='o')
-    ax.set_title("Evolución de las Medallas")
-    ax.set_xlabel("Año")
-    ax.set_ylabel("Número de Medallas")
-    st.pyplot(fig)
-
-# Carga del dataset
-data = load_data()
-
-# Título principal
-st.title("🏆 Conclusiones y Recomendaciones")
-
-# Resumen de hallazgos clave
-st.markdown("""
-### Resumen de Hallazgos
-- Los países con mayor PIB y población tienden a tener mejores resultados en los JJOO.
-- Las anomalías climáticas pueden afectar la participación en deportes al aire libre.
-- El análisis histórico muestra fluctuaciones cíclicas en el rendimiento por región y deporte.
-
-### Implicaciones
-- Invertir en programas deportivos y sostenibilidad puede maximizar el éxito olímpico.
-- Comprender las tendencias históricas permite planificar con anticipación.
-
-### Líneas Futuras
-- Ampliar el análisis para incluir deportes específicos y datos de género.
-- Incorporar factores culturales y políticas deportivas nacionales.
-""")
-
-# Visualizaciones
-col1, col2 = st.columns(2)
-
-with col1:
-    plot_top_countries(data)
-
-with col2:
-    plot_medals_over_time(data)
-
-# Resumen de predicciones
-st.markdown("## 🔮 Resumen de Predicciones")
-st.markdown("""
-- **Modelo ARIMA**: Predicciones cíclicas para el total de medallas en los próximos JJOO.
-- **Modelo XGBoost**: Estimaciones precisas de participación utilizando datos macroeconómicos y climáticos.
-""")
-
-# Descarga de archivo PDF
-st.markdown("### 📥 Descarga del Resumen en PDF")
-st.markdown("""
-Puedes descargar un resumen profesional en formato PDF con todos los hallazgos y predicciones.
-""")
-
-def generate_pdf():
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Resumen del Proyecto JJOO", ln=True, align='C')
-    pdf.ln(10)
-    pdf.multi_cell(0, 10, txt="""
-    Resumen de Hallazgos:
+    st.image(chart_images(data, dataset_version())[1])
+
+# La página no tiene función propia: todo el contenido se mide como una ejecución de la página
+with page_span("page_conclusion"):
+    # Carga del dataset
+    with span("load_data"):
+        data = load_data()
+
+    # Título principal
+    st.title("🏆 Conclusiones y Recomendaciones")
+
+    # Resumen de hallazgos clave
+    st.markdown("""
+    ### Resumen de Hallazgos
     - Los países con mayor PIB y población tienden a tener mejores resultados en los JJOO.
     - Las anomalías climáticas pueden afectar la participación en deportes al aire libre.
     - El análisis histórico muestra fluctuaciones cíclicas en el rendimiento por región y deporte.
 
-    Implicaciones:
+    ### Implicaciones
     - Invertir en programas deportivos y sostenibilidad puede maximizar el éxito olímpico.
     - Comprender las tendencias históricas permite planificar con anticipación.
 
-    Líneas Futuras:
+    ### Líneas Futuras
     - Ampliar el análisis para incluir deportes específicos y datos de género.
     - Incorporar factores culturales y políticas deportivas nacionales.
+    """)
+
+    # Visualizaciones
+    col1, col2 = st.columns(2)
+
+    with col1:
+        with span("top_countries.chart"):
+            plot_top_countries(data)
 
-    Resumen de Predicciones:
-    - Modelo ARIMA: Predicciones cíclicas para el total de medallas en los próximos JJOO.
-    - Modelo XGBoost: Estimaciones precisas de participación utilizando datos macroeconómicos y climáticos.
+    with col2:
+        with span("medals_over_time.chart"):
+            plot_medals_over_time(data)
+
+    # Resumen de predicciones
+    st.markdown("## 🔮 Resumen de Predicciones")
+    st.markdown("""
+    - **Modelo ARIMA**: Predicciones cíclicas para el total de medallas en los próximos JJOO.
+    - **Modelo XGBoost**: Estimaciones precisas de participación utilizando datos macroeconómicos y climáticos.
+    """)
+
+    # Descarga de archivo PDF
+    st.markdown("### 📥 Descarga del Resumen en PDF")
+    st.markdown("""
+    Puedes descargar un resumen profesional en formato PDF con todos los hallazgos y predicciones.
     """)
-    pdf.output("Resumen_Proyecto_JJOO.pdf")
-
-if st.button("Generar y Descargar PDF"):
-    generate_pdf()
-    pdf_path = "Resumen_Proyecto_JJOO.pdf"
-    with open(pdf_path, "rb") as pdf_file:
-        st.download_button(
-            label="Descargar PDF",
-            data=pdf_file,
-            file_name=pdf_path,
-            mime="application/pdf"
-        )
+
+    # El PDF se genera en memoria en un hilo de fondo (report.py) y se cachea por el hash de su contenido:
+    # el clic vuelve enseguida y las descargas repetidas con los mismos datos no lo regeneran
+    if st.button("Generar y Descargar PDF"):
+        st.session_state["report_requested"] = True
+
+    if st.session_state.get("report_requested"):
+        with span("submit_report"):
+            report_job = submit_report(report_content(data), chart_images(data, dataset_version()))
+        if not report_job.done():
+            st.info("El PDF se está generando en segundo plano. Pulsa «Actualizar» en unos segundos.")
+            st.button("Actualizar")
+        elif report_job.exception() is not None:
+            st.error(f"No se pudo generar el PDF: {report_job.exception()}")
+        else:
+            st.download_button(
+                label="Descargar PDF",
+                data=report_job.result(),
+                file_name=REPORT_FILE_NAME,
+                mime="application/pdf"
+            )
 
 # Nota final
 st.info("Gracias por explorar este proyecto. Esperamos que los hallazgos sean útiles para futuros análisis deportivos y estratégicos.")
+
+performance_panel()
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# Instrumentación del tiempo de renderizado de las páginas.
+#   JJOO_PERF_PANEL=1             muestra en la barra lateral las últimas mediciones de la sesión
+#   JJOO_SPANS_PATH=spans.jsonl   añade cada medición como una línea JSON para analizarlas fuera de la app
+PANEL_ENABLED = os.environ.get("JJOO_PERF_PANEL", "") not in ("", "0")
+SPANS_PATH = os.environ.get("JJOO_SPANS_PATH")
+# Hay alguien leyendo las mediciones: se pueden calcular datos extra (p. ej. el tamaño de las figuras)
+PERF_ENABLED = PANEL_ENABLED or bool(SPANS_PATH)
+# Mediciones que se conservan por sesión y filas que muestra el panel
+MAX_SPANS = 500
+PANEL_ROWS = 30
+
+# Página en curso de cada hilo (Streamlit ejecuta cada sesión en su propio hilo)
+_current = threading.local()
+_export_lock = threading.Lock()
+
+
+def _session_spans():
+    if "perf_spans" not in st.session_state:
+        st.session_state["perf_spans"] = deque(maxlen=MAX_SPANS)
+        st.session_state["perf_session"] = uuid.uuid4().hex[:12]
+        st.session_state["perf_run"] = 0
+    return st.session_state["perf_spans"]
+
+
+def export_spans(spans, path):
+    """
+    Añade las mediciones a un archivo JSON Lines (una medición por línea).
+    """
+    with _export_lock, open(path, "a", encoding="utf-8") as f:
+        for record in spans:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _record(page, name, start, elapsed, ok, fields):
+    spans = _session_spans()
+    record = {
+        "timestamp": start,
+        "session": st.session_state["perf_session"],
+        "run": st.session_state["perf_run"],
+        "page": page,
+        "span": name,
+        "ms": round(elapsed * 1000, 3),
+        "ok": ok,
+        **fields,
+    }
+    spans.append(record)
+    if SPANS_PATH:
+        export_spans([record], SPANS_PATH)
+
+
+@contextmanager
+def span(name, page=None):
+    """
+    Mide la duración del bloque y la guarda con su nombre y el de la página en curso
+    (o `page` si se indica). Si el bloque lanza una excepción se registra con ok=False.
+    Devuelve un diccionario en el que el bloque puede añadir datos a la medición (p. ej. bytes).
+    """
+    page = page or getattr(_current, "page", None)
+    start, t0, ok, fields = time.time(), time.perf_counter(), False, {}
+    try:
+        yield fields
+        ok = True
+    finally:
+        _record(page, name, start, time.perf_counter() - t0, ok, fields)
+
+
+@contextmanager
+def page_span(page):
+    """
+    Marca una ejecución completa de una página (como decorador de la función de la página o como bloque `with`).
+    Las mediciones de `span` dentro de ella quedan asociadas a la página y a esta ejecución.
+    """
+    _session_spans()
+    st.session_state["perf_run"] += 1
+    previous, _current.page = getattr(_current, "page", None), page
+    try:
+        with span("total", page):
+            yield
+    finally:
+        _current.page = previous
+
+
+def performance_panel(rows=PANEL_ROWS):
+    """
+    Panel opcional en la barra lateral con las últimas mediciones de la sesión (JJOO_PERF_PANEL=1).
+    Se llama al final de cada página para incluir las mediciones de la ejecución actual.
+    """
+    if not PANEL_ENABLED:
+        return
+    spans = list(_session_spans())
+    with st.sidebar.expander("⏱️ Rendimiento", expanded=True):
+        if not spans:
+            st.caption("Todavía no hay mediciones.")
+            return
+        recent = pd.DataFrame(spans[-rows:][::-1])
+        columns = ["run", "page", "span", "ms", "ok"] + (["bytes"] if "bytes" in recent.columns else [])
+        st.dataframe(recent[columns], hide_index=True)
+        st.download_button(
+            label="Descargar mediciones (JSONL)",
+            data="".join(json.dumps(record, ensure_ascii=False) + "\n" for record in spans),
+            file_name="spans.jsonl",
+            mime="application/json"
+        )
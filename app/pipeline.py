@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_loader import APP_DIR, DATASET_CSV, artifacts_are_current, build_dataset
+from model_registry import artifact_digest
+
+# Pipeline que construye final_dataset_cleaned.csv a partir de los CSV originales (antes, JJOO.ipynb):
+#   python app/pipeline.py [--raw-dir DIR] [--force]
+# Cada etapa guarda su resultado en BUILD_DIR y solo se recalcula si cambian sus entradas.
+RAW_DIR = APP_DIR
+BUILD_DIR = os.path.join(APP_DIR, "build")
+MANIFEST_NAME = "manifest.json"
+CHUNK_ROWS = 100_000
+
+ATHLETE_COLUMNS = ["Sex", "Age", "Height", "Weight", "NOC", "Year", "Season", "Sport", "Medal"]
+ATHLETE_DTYPES = {
+    "Sex": "category", "Age": "float64", "Height": "float64", "Weight": "float64", "NOC": "category",
+    "Year": "int16", "Season": "category", "Sport": "category", "Medal": "category",
+}
+# Rangos plausibles de edad, altura y peso (los mismos que en el notebook)
+PLAUSIBLE_RANGES = {"Age": (15, 60), "Height": (130, 220), "Weight": (30, 200)}
+OLYMPIC_YEARS = [1960, 1964, 1968, 1972, 1976, 1980, 1984, 1988, 1992, 1996, 2000, 2004, 2008, 2012, 2016]
+POPULATION_YEARS = list(range(1960, 2023))
+COUNTRY_DTYPES = {"Country Name": "str", "Country Code": "str"}
+METADATA_COLUMNS = ["Country Code", "Region", "Income Group", "Notes", "Country Name", "Extra"]
+
+
+def read_csv_chunked(path, dtype, usecols=None, chunksize=CHUNK_ROWS, **kwargs):
+    """
+    Lee un CSV por bloques con tipos explícitos, uniendo las categorías de todos los bloques.
+    """
+    chunks = list(pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize, **kwargs))
+    categorical = [col for col in chunks[0].columns if dtype.get(col) == "category"]
+    frame = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for col in categorical:
+        frame[col] = union_categoricals([chunk[col] for chunk in chunks])
+    return frame[chunks[0].columns]
+
+
+def clean_athletes(path):
+    """
+    athlete_events.csv: medias para los valores ausentes, "No Medal", rangos plausibles y sin duplicados.
+    """
+    athletes = read_csv_chunked(path, ATHLETE_DTYPES, usecols=ATHLETE_COLUMNS)
+    for col in ["Age", "Height", "Weight"]:
+        athletes[col] = athletes[col].fillna(athletes[col].mean())
+    athletes["Medal"] = athletes["Medal"].cat.add_categories("No Medal").fillna("No Medal")
+
+    mask = pd.Series(True, index=athletes.index)
+    for col, (low, high) in PLAUSIBLE_RANGES.items():
+        mask &= athletes[col].between(low, high)
+    return athletes[mask].drop_duplicates()[ATHLETE_COLUMNS].reset_index(drop=True)
+
+
+def clean_gdp(path):
+    """
+    gdp_by_country.csv en formato largo (país, año olímpico, PIB).
+    Como en el notebook, los PIB ausentes no se imputan aquí: quedan a 0 en el dataset final.
+    """
+    columns = ["Country Name", "Country Code"] + [str(year) for year in OLYMPIC_YEARS]
+    dtype = {**COUNTRY_DTYPES, **{col: "float64" for col in columns[2:]}}
+    gdp = read_csv_chunked(path, dtype, usecols=columns, skiprows=4)
+    gdp_long = gdp[columns].melt(id_vars=["Country Name", "Country Code"], var_name="Year", value_name="GDP")
+    gdp_long["Year"] = gdp_long["Year"].astype("int16")
+    return gdp_long
+
+
+def clean_population(path):
+    """
+    population_by_country.csv: valores ausentes con la media del año, sin duplicados y en formato largo.
+    """
+    columns = ["Country Name", "Country Code"] + [str(year) for year in POPULATION_YEARS]
+    dtype = {**COUNTRY_DTYPES, **{col: "float64" for col in columns[2:]}}
+    population = read_csv_chunked(path, dtype, usecols=columns, skiprows=4)[columns]
+    population[columns[2:]] = population[columns[2:]].fillna(population[columns[2:]].mean())
+    population = population.drop_duplicates()
+    population_long = population.melt(id_vars=["Country Name", "Country Code"], var_name="Year", value_name="Population")
+    population_long["Year"] = population_long["Year"].astype("int16")
+    return population_long
+
+
+def clean_temperature(path):
+    """
+    Global_Temperature.csv: anomalías anual y mensual medias por año desde 1896.
+    """
+    temperature = pd.read_csv(path)
+    temperature.columns = temperature.columns.str.strip()
+    temperature = temperature[["Year", "Annual Anomaly", "Monthly Anomaly"]].copy()
+    for col in ["Annual Anomaly", "Monthly Anomaly"]:
+        temperature[col] = pd.to_numeric(temperature[col], errors="coerce")
+    temperature = temperature[temperature["Year"] >= 1896]
+    temperature = temperature.groupby("Year").mean(numeric_only=True).reset_index()
+    temperature["Year"] = temperature["Year"].astype("int16")
+    return temperature
+
+
+def clean_metadata(path, athletes):
+    """
+    Metadata_Country_GDP.csv: región y grupo de ingresos de los países que aparecen en athlete_events.
+    Se lee igual que en el notebook (skiprows=4 y columnas renombradas) para obtener el mismo dataset.
+    """
+    metadata = pd.read_csv(path, skiprows=4, dtype=str)
+    metadata.columns = METADATA_COLUMNS
+    metadata = metadata[["Country Code", "Region", "Income Group"]].drop_duplicates()
+    metadata = metadata.dropna(subset=["Country Code"])
+    return metadata[metadata["Country Code"].isin(athletes["NOC"].unique())].reset_index(drop=True)
+
+
+def merge_sources(athletes, metadata, gdp, population, temperature):
+    """
+    Cadena de merges del notebook. Se conserva como referencia para join_benchmark.py.
+    """
+    final = athletes.merge(metadata, left_on="NOC", right_on="Country Code", how="left")
+    final = final.merge(population, left_on=["NOC", "Year"], right_on=["Country Code", "Year"], how="left")
+    final = final.merge(gdp, left_on=["NOC", "Year"], right_on=["Country Code", "Year"], how="left")
+    final = final.merge(temperature[["Year", "Annual Anomaly", "Monthly Anomaly"]], on="Year", how="left")
+    final = final.drop(columns=["Country Code_x", "Country Code_y", "Country Name_y", "Country Name_x"], errors="ignore")
+    final["Population"] = final["Population"].fillna(0)
+    final["GDP"] = final["GDP"].fillna(0)
+    return final
+
+
+def _check_unique(frame, keys, name):
+    # La búsqueda por posición asume una fila por clave (la cadena de merges duplicaría atletas)
+    if frame.duplicated(subset=keys).any():
+        raise ValueError(f"{name}: claves {keys} duplicadas")
+
+
+def _country_year_table(frame, column, countries, years):
+    # Matriz (país, año) con los valores de `column`. La fila extra queda a NaN y recibe el código -1
+    # (atletas sin NOC), de modo que la búsqueda no necesita comprobar límites.
+    rows = countries.get_indexer(frame["Country Code"])
+    cols = years.get_indexer(frame["Year"])
+    found = (rows >= 0) & (cols >= 0)
+    table = np.full((len(countries) + 1, len(years)), np.nan)
+    table[rows[found], cols[found]] = frame[column].to_numpy(dtype=float)[found]
+    return table
+
+
+def join_sources(athletes, metadata, gdp, population, temperature):
+    """
+    Une atletas, metadatos, población, PIB y temperatura en el dataset final.
+    Los países (categorías de NOC) y los años se convierten en claves enteras densas y cada valor se
+    obtiene por posición en matrices (país, año) construidas una vez, sin merges de tablas completas.
+    El resultado tiene las mismas filas y columnas que la cadena de merges del notebook (merge_sources).
+    """
+    _check_unique(metadata, ["Country Code"], "metadata")
+    _check_unique(population, ["Country Code", "Year"], "population")
+    _check_unique(gdp, ["Country Code", "Year"], "gdp")
+    _check_unique(temperature, ["Year"], "temperature")
+
+    noc = athletes["NOC"].astype("category")
+    countries = pd.Index(noc.cat.categories.astype(str))
+    years = pd.Index(np.sort(athletes["Year"].unique()))
+    country_key = noc.cat.codes.to_numpy()
+    year_key = years.get_indexer(athletes["Year"])
+
+    final = athletes.copy()
+    country_metadata = metadata.set_index("Country Code").reindex(countries)
+    for col in ["Region", "Income Group"]:
+        # Se añade un código -1 al final para los atletas sin NOC
+        values = pd.Categorical(country_metadata[col])
+        final[col] = pd.Categorical.from_codes(np.append(values.codes, -1)[country_key], values.categories)
+
+    population_table = _country_year_table(population, "Population", countries, years)
+    final["Population"] = np.nan_to_num(population_table[country_key, year_key], nan=0.0)
+
+    # "Country Code" del PIB: el NOC si el país y el año aparecen en la tabla de PIB (aunque el valor falte)
+    gdp_present = _country_year_table(gdp.assign(Present=1.0), "Present", countries, years)
+    in_gdp = ~np.isnan(gdp_present[country_key, year_key])
+    final["Country Code"] = noc.astype(object).where(in_gdp)
+    gdp_table = _country_year_table(gdp, "GDP", countries, years)
+    final["GDP"] = np.nan_to_num(gdp_table[country_key, year_key], nan=0.0)
+
+    anomalies = temperature.set_index("Year").reindex(years)
+    for col in ["Annual Anomaly", "Monthly Anomaly"]:
+        final[col] = anomalies[col].to_numpy(dtype=float)[year_key]
+    return final
+
+
+# Etapas en orden de ejecución: archivos originales que lee, etapas de las que depende y función.
+# Al cambiar la lógica de una etapa se incrementa su versión para forzar que se recalcule.
+Stage = namedtuple("Stage", ["inputs", "depends_on", "build", "version"])
+STAGES = {
+    "athletes": Stage(["athlete_events.csv"], [], clean_athletes, 1),
+    "gdp": Stage(["gdp_by_country.csv"], [], clean_gdp, 1),
+    "population": Stage(["population_by_country.csv"], [], clean_population, 1),
+    "temperature": Stage(["Global_Temperature.csv"], [], clean_temperature, 1),
+    "metadata": Stage(["Metadata_Country_GDP.csv"], ["athletes"], clean_metadata, 1),
+    "final": Stage([], ["athletes", "metadata", "gdp", "population", "temperature"], join_sources, 2),
+}
+
+
+def _read_manifest(build_dir):
+    path = os.path.join(build_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(build_dir, manifest):
+    path = os.path.join(build_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _stage_key(name, stage, input_hashes, manifest):
+    # Hash de todo lo que determina el resultado de la etapa: su versión, sus archivos y sus dependencias
+    payload = {
+        "stage": name,
+        "version": stage.version,
+        "inputs": input_hashes,
+        "depends_on": {dep: manifest[dep]["output"] for dep in stage.depends_on},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def run_pipeline(raw_dir=RAW_DIR, build_dir=BUILD_DIR, output_csv=DATASET_CSV, force=False):
+    """
+    Ejecuta las etapas cuyas entradas han cambiado y, si cambia el resultado final, escribe `output_csv`.
+    Los archivos derivados del CSV (data_loader.dataset_artifacts, junto a `output_csv`) se regeneran
+    si ha cambiado el CSV o si falta o está desactualizado alguno de ellos.
+    Devuelve un diccionario etapa -> "rebuilt" o "cached".
+    """
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = _read_manifest(build_dir)
+    frames = {}
+    report = {}
+
+    def stage_frame(name):
+        if name not in frames:
+            frames[name] = pd.read_parquet(os.path.join(build_dir, f"{name}.parquet"))
+        return frames[name]
+
+    for name, stage in STAGES.items():
+        input_hashes = {file: artifact_digest(os.path.join(raw_dir, file)) for file in stage.inputs}
+        key = _stage_key(name, stage, input_hashes, manifest)
+        output_path = os.path.join(build_dir, f"{name}.parquet")
+        if not force and manifest.get(name, {}).get("key") == key and os.path.exists(output_path):
+            report[name] = "cached"
+            continue
+
+        args = [os.path.join(raw_dir, file) for file in stage.inputs] + [stage_frame(dep) for dep in stage.depends_on]
+        frames[name] = stage.build(*args)
+        frames[name].to_parquet(output_path + ".tmp", index=False)
+        os.replace(output_path + ".tmp", output_path)
+        manifest[name] = {"key": key, "inputs": input_hashes, "output": artifact_digest(output_path)}
+        _write_manifest(build_dir, manifest)
+        report[name] = "rebuilt"
+
+    if report["final"] == "rebuilt" or not os.path.exists(output_csv):
+        stage_frame("final").to_csv(output_csv, index=False)
+    if not artifacts_are_current(output_csv):
+        build_dataset(output_csv)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye final_dataset_cleaned.csv a partir de los datos originales.")
+    parser.add_argument("--raw-dir", default=RAW_DIR, help="Carpeta con los CSV originales")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="Carpeta para los resultados intermedios")
+    parser.add_argument("--output", default=DATASET_CSV, help="Ruta del CSV final")
+    parser.add_argument("--force", action="store_true", help="Recalcular todas las etapas")
+    args = parser.parse_args()
+
+    for stage_name, status in run_pipeline(args.raw_dir, args.build_dir, args.output, args.force).items():
+        print(f"{stage_name}: {status}")
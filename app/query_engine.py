@@ -0,0 +1,73 @@
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import CUBE_PARQUET, DATASET_PARQUET, dataset_version, load_cube, load_dataset, parquet_is_current
+from medal_cube import filter_cells, rollup
+
+# Consultas de las páginas sobre los Parquet del dataset con pyarrow.dataset: los filtros (el mismo `where`
+# que medal_cube.filter_cells) se compilan a expresiones de pyarrow y solo se leen las columnas necesarias
+# y los row groups cuyas estadísticas pueden cumplir el filtro. Sin pyarrow o sin Parquet actualizado,
+# las consultas se responden con el cubo o el dataset en memoria.
+IN_MEMORY_SOURCES = {CUBE_PARQUET: load_cube, DATASET_PARQUET: load_dataset}
+
+
+def _scalar(value):
+    # Los valores de numpy (p. ej. los años de cube["Year"].unique()) se pasan a pyarrow como escalares de Python
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def compile_filter(where):
+    """
+    Expresión de pyarrow.dataset equivalente a `where` (diccionario columna -> valor, lista de valores
+    o tupla (mínimo, máximo) inclusiva). Devuelve None si no hay filtro.
+    """
+    import pyarrow.dataset as ds
+
+    expression = None
+    for column, value in (where or {}).items():
+        field = ds.field(column)
+        if isinstance(value, tuple):
+            low, high = value
+            conditions = []
+            if low is not None:
+                conditions.append(field >= _scalar(low))
+            if high is not None:
+                conditions.append(field <= _scalar(high))
+        elif isinstance(value, (list, set, np.ndarray, pd.Index, pd.Series)):
+            conditions = [field.isin([_scalar(item) for item in value])]
+        else:
+            conditions = [field == _scalar(value)]
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+    return expression
+
+
+@st.cache_resource(max_entries=4)
+def _parquet_dataset(path, version):
+    # Metadatos del Parquet (esquema y estadísticas de los row groups), leídos una vez por versión del dataset
+    import pyarrow.dataset as ds
+
+    return ds.dataset(path, format="parquet")
+
+
+def scan(columns, where=None, source=CUBE_PARQUET):
+    """
+    Filas de `source` que cumplen `where`, solo con las columnas `columns`, como DataFrame.
+    """
+    if find_spec("pyarrow") is None or not parquet_is_current(source):
+        return filter_cells(IN_MEMORY_SOURCES[source](), where)[list(columns)].reset_index(drop=True)
+    dataset = _parquet_dataset(source, dataset_version())
+    return dataset.to_table(columns=list(columns), filter=compile_filter(where)).to_pandas()
+
+
+def query(by, where=None, measures=(), observed=True):
+    """
+    Equivalente a medal_cube.rollup(cube, by, where, measures) leyendo del Parquet del cubo
+    solo las claves de `by`, los recuentos y las medidas pedidas de las celdas que cumplen `where`.
+    """
+    columns = list(dict.fromkeys([*by, "count", *[f"{measure}_{stat}" for measure in measures for stat in ("sum", "n")]]))
+    cells = scan(columns, where)
+    return rollup(cells, by, measures=measures, observed=observed)
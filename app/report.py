@@ -0,0 +1,220 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import streamlit as st
+
+from forecasting import ARIMA_ARTIFACT_PATH, forecast_years
+from medal_cube import MEDAL_TYPES, rollup
+from model_registry import artifact_digest, load_artifact
+
+# Informe PDF de la página de conclusiones. Se genera en memoria en un hilo de fondo y se cachea por el
+# hash de su contenido: varias sesiones con los mismos datos comparten el mismo PDF y nada se escribe en disco.
+REPORT_TITLE = "Resumen del Proyecto JJOO"
+REPORT_FILE_NAME = "Resumen_Proyecto_JJOO.pdf"
+REPORT_SECTIONS = [
+    ("Resumen de Hallazgos", [
+        "Los países con mayor PIB y población tienden a tener mejores resultados en los JJOO.",
+        "Las anomalías climáticas pueden afectar la participación en deportes al aire libre.",
+        "El análisis histórico muestra fluctuaciones cíclicas en el rendimiento por región y deporte.",
+    ]),
+    ("Implicaciones", [
+        "Invertir en programas deportivos y sostenibilidad puede maximizar el éxito olímpico.",
+        "Comprender las tendencias históricas permite planificar con anticipación.",
+    ]),
+    ("Líneas Futuras", [
+        "Ampliar el análisis para incluir deportes específicos y datos de género.",
+        "Incorporar factores culturales y políticas deportivas nacionales.",
+    ]),
+    ("Resumen de Predicciones", [
+        "Modelo ARIMA: Predicciones cíclicas para el total de medallas en los próximos JJOO.",
+        "Modelo XGBoost: Estimaciones precisas de participación utilizando datos macroeconómicos y climáticos.",
+    ]),
+]
+FORECAST_STEPS = 5
+# Informes distintos que se conservan en memoria (los más antiguos se descartan)
+MAX_REPORTS = 8
+# Primera versión de fpdf2 con el argumento text= (en ella txt= y ln= quedan obsoletos)
+FPDF_MIN_VERSION = (2, 7, 6)
+
+_jobs_lock = threading.Lock()
+
+
+def top_countries(cube):
+    """
+    Los 10 países con más filas (participaciones con o sin medalla) del cubo.
+    """
+    return rollup(cube, ['NOC']).set_index('NOC')['count'].sort_values(ascending=False).head(10)
+
+
+def medals_by_year(cube):
+    """
+    Número de filas del cubo por año.
+    """
+    return rollup(cube, ['Year']).set_index('Year')['count']
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=120, bbox_inches="tight")
+    finally:
+        # Se liberan los ejes y artistas en cuanto se tienen los bytes
+        fig.clear()
+    return buffer.getvalue()
+
+
+def top_countries_png(series):
+    """
+    Gráfico de barras del top 10 de países en PNG. Se usa matplotlib.figure.Figure (sin pyplot):
+    la figura no queda registrada en ningún sitio y se libera al salir de la función.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    series.plot(kind='bar', ax=ax, color='gold')
+    ax.set_title("Top 10 Países con Más Medallas")
+    ax.set_ylabel("Número de Medallas")
+    return _png(fig)
+
+
+def medals_over_time_png(series):
+    """
+    Gráfico de la evolución de las medallas por año en PNG (sin pyplot, como top_countries_png).
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    series.plot(ax=ax, color='skyblue', marker='o')
+    ax.set_title("Evolución de las Medallas")
+    ax.set_xlabel("Año")
+    ax.set_ylabel("Número de Medallas")
+    return _png(fig)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def chart_images(_cube, data_version):
+    """
+    PNG de los dos gráficos de la página de conclusiones, generados una vez por versión del dataset.
+    Devuelve (top 10 de países, evolución por año).
+    """
+    return top_countries_png(top_countries(_cube)), medals_over_time_png(medals_by_year(_cube))
+
+
+def report_content(cube):
+    """
+    Todo lo que determina el informe, en tipos simples: textos, datos de los gráficos y versión del modelo ARIMA.
+    """
+    medal_years = rollup(cube, ['Year'], where={'Medal': MEDAL_TYPES})['Year']
+    return {
+        "title": REPORT_TITLE,
+        "sections": REPORT_SECTIONS,
+        "top_countries": {str(noc): int(count) for noc, count in top_countries(cube).items()},
+        "medals_by_year": {int(year): int(count) for year, count in medals_by_year(cube).items()},
+        "forecast_years": forecast_years(medal_years, FORECAST_STEPS),
+        "arima_digest": artifact_digest(ARIMA_ARTIFACT_PATH) if os.path.exists(ARIMA_ARTIFACT_PATH) else None,
+    }
+
+
+def content_hash(content):
+    """
+    Hash SHA-256 del contenido del informe.
+    """
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _forecast_rows(content):
+    # Predicción del modelo ARIMA guardado; sin modelo, el informe se genera sin la tabla
+    if content["arima_digest"] is None:
+        return []
+    forecast = load_artifact(ARIMA_ARTIFACT_PATH).forecast(steps=FORECAST_STEPS)
+    return list(zip(content["forecast_years"], np.asarray(forecast).round().astype(int)))
+
+
+def _fpdf_class():
+    # El informe usa la API de fpdf2 >= 2.7.6 (text=, new_x/new_y, imágenes desde BytesIO, output() en bytes);
+    # PyFPDF 1.7 también se importa como `fpdf` pero no la admite, así que se rechaza con un error explícito
+    import fpdf
+
+    version = str(getattr(fpdf, "__version__", None) or getattr(fpdf, "FPDF_VERSION", "0"))
+    if tuple(int(part) for part in version.split(".")[:3] if part.isdigit()) < FPDF_MIN_VERSION:
+        required = ".".join(map(str, FPDF_MIN_VERSION))
+        raise ImportError(f"El informe PDF requiere fpdf2 >= {required} (pip install -U fpdf2); está instalado fpdf {version}")
+    return fpdf.FPDF
+
+
+def build_pdf(content, images):
+    """
+    Genera el PDF en memoria (requiere fpdf2) con los textos, los dos gráficos y la tabla de predicciones ARIMA.
+    `images` son los PNG ya generados de los gráficos (ver chart_images). Devuelve los bytes del documento.
+    """
+    FPDF = _fpdf_class()
+    from fpdf.enums import XPos, YPos
+
+    # Tras la celda, salto al margen izquierdo de la línea siguiente (el antiguo ln=True)
+    next_line = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.cell(200, 10, text=content["title"], align='C', **next_line)
+    pdf.ln(10)
+    for title, items in content["sections"]:
+        pdf.set_font("Helvetica", style="B", size=12)
+        pdf.cell(0, 8, text=f"{title}:", **next_line)
+        pdf.set_font("Helvetica", size=11)
+        for item in items:
+            pdf.multi_cell(0, 6, text=f"- {item}", **next_line)
+        pdf.ln(4)
+
+    pdf.add_page()
+    for image in images:
+        pdf.image(io.BytesIO(image), w=170)
+
+    forecast = _forecast_rows(content)
+    if forecast:
+        pdf.add_page()
+        pdf.set_font("Helvetica", style="B", size=12)
+        pdf.cell(0, 8, text="Predicciones ARIMA del total de medallas", **next_line)
+        pdf.set_font("Helvetica", size=11)
+        pdf.cell(40, 8, text="Año", border=1)
+        pdf.cell(60, 8, text="Predicción de Medallas", border=1, **next_line)
+        for year, value in forecast:
+            pdf.cell(40, 8, text=str(year), border=1)
+            pdf.cell(60, 8, text=str(value), border=1, **next_line)
+
+    return bytes(pdf.output())
+
+
+@st.cache_resource
+def _report_executor():
+    # Un solo hilo de fondo por proceso: los informes se generan de uno en uno sin bloquear las páginas
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-report")
+
+
+@st.cache_resource
+def _report_jobs():
+    # hash del contenido -> Future con los bytes del PDF, compartido entre sesiones
+    return {}
+
+
+def submit_report(content, images):
+    """
+    Encola la generación del informe si no existe ya uno con el mismo contenido (o si el anterior falló)
+    y devuelve su Future sin esperar a que termine. `images` son los PNG de chart_images para los mismos datos.
+    """
+    key = content_hash(content)
+    jobs = _report_jobs()
+    with _jobs_lock:
+        job = jobs.get(key)
+        if job is None or (job.done() and job.exception() is not None):
+            jobs.pop(key, None)
+            jobs[key] = _report_executor().submit(build_pdf, content, tuple(images))
+            while len(jobs) > MAX_REPORTS:
+                jobs.pop(next(iter(jobs)))
+        return jobs[key]
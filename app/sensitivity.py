@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from model_registry import PARTICIPATION_FEATURES, WARMUP_SCENARIO, predict_participation
+
+# Escenario base del análisis de sensibilidad (el primer país de ejemplo del notebook)
+BASE_SCENARIO = dict(WARMUP_SCENARIO)
+
+# Variables que se pueden barrer: etiqueta, unidad de los controles y rangos (en esa unidad)
+SWEEP_FEATURES = {
+    "GDP": {"label": "PIB (miles de millones USD)", "scale": 1e9, "limits": (1.0, 25000.0), "default": (1500.0, 3000.0)},
+    "Population": {"label": "Población (millones)", "scale": 1e6, "limits": (1.0, 2000.0), "default": (50.0, 2000.0)},
+    "Annual Anomaly": {"label": "Anomalía climática anual (°C)", "scale": 1.0, "limits": (-1.0, 2.0), "default": (-1.0, 1.0)},
+}
+
+
+def build_grid(axes, base=BASE_SCENARIO):
+    """
+    Construye la rejilla completa de escenarios como una sola matriz.
+    axes: lista de (variable, valores) con una o dos variables; el resto de variables toma el valor de `base`.
+    """
+    mesh = np.meshgrid(*[values for _, values in axes], indexing="ij")
+    size = mesh[0].size
+    grid = pd.DataFrame({feature: np.full(size, base[feature], dtype="float64") for feature in PARTICIPATION_FEATURES})
+    for (feature, _), values in zip(axes, mesh):
+        grid[feature] = values.ravel()
+    return grid
+
+
+@st.cache_data(max_entries=64, show_spinner="Calculando el análisis de sensibilidad...")
+def sensitivity_sweep(_participation_model, model_key, axes_spec, base_items=tuple(BASE_SCENARIO.items())):
+    """
+    Predice toda la rejilla definida por `axes_spec` en una única llamada al modelo.
+    axes_spec: tupla de (variable, inicio, fin, puntos); el resultado se cachea por especificación y versión del modelo.
+    Devuelve los valores de cada eje y la matriz de predicciones (una dimensión por eje).
+    """
+    axes = [(feature, np.linspace(start, stop, steps)) for feature, start, stop, steps in axes_spec]
+    grid = build_grid(axes, dict(base_items))
+    predictions = predict_participation(_participation_model, grid)
+    return [values for _, values in axes], predictions.reshape([len(values) for _, values in axes])